@@ -2,4 +2,19 @@
 DiagramForm - Diagram generator from Terraform state files
 """
 
-__version__ = '0.1.0'
\ No newline at end of file
+__version__ = '0.1.0'
+
+from .model import Graph, Node, Edge, Cluster
+from .parser import TerraformStateParser
+from .builder import GraphBuilder, build_graph, load_graph
+
+__all__ = [
+    'Graph',
+    'Node',
+    'Edge',
+    'Cluster',
+    'TerraformStateParser',
+    'GraphBuilder',
+    'build_graph',
+    'load_graph',
+]
@@ -0,0 +1,635 @@
+"""
+Module for building renderer-independent graphs from Terraform resources
+"""
+import sys
+from typing import Dict, List, Any, Optional
+from . import __version__
+from .filters import ResourceFilter
+from .model import Graph, Node
+from .parser import TerraformStateParser, get_module_path
+from .providers import PROVIDER_GROUPINGS, get_value, friendly_type_name
+from .query import select_neighbourhood
+
+# Fields available to node label templates
+LABEL_TEMPLATE_FIELDS = ('name', 'type', 'friendly_type', 'address', 'module')
+
+
+def check_label_template(template: str):
+    """
+    Checks that a node label template can be formatted with the available fields
+    
+    Args:
+        template: Node label template, e.g. '{name}\\n{friendly_type}'
+        
+    Raises:
+        ValueError: If the template is malformed or uses an unknown field
+    """
+    try:
+        template.format(**{field: '' for field in LABEL_TEMPLATE_FIELDS})
+    except KeyError as e:
+        raise ValueError(f"unknown field {{{e.args[0]}}}, "
+                         f"use {', '.join('{' + field + '}' for field in LABEL_TEMPLATE_FIELDS)}") from None
+    except (ValueError, IndexError, AttributeError) as e:
+        raise ValueError(f"invalid template: {e}") from None
+
+
+class GraphBuilder:
+    """Builds the graph of a diagram from Terraform resources"""
+    
+    def __init__(self, resources: List[Dict[str, Any]], dependencies: Dict[str, List[str]]):
+        """
+        Initializes the builder with resources and dependencies
+        
+        Args:
+            resources: List of resources extracted from the state
+            dependencies: Dictionary of resource dependencies
+        """
+        self.resources = resources
+        self.dependencies = dependencies
+        self.graph = Graph()
+        self.nodes = self.graph.nodes  # Nodes created by address
+        self.aliases = {}  # Address -> node representing it, for collapsed resources
+        self.label_template = None
+        self.max_label_length = None
+    
+    def build(self, filter_types: List[str] = None, group_by: str = None, exclude_types: List[str] = None,
+              nested_clusters: bool = False, focus: Optional[str] = None, radius: int = 1,
+              direction: str = 'both', module_depth: Optional[int] = None,
+              label_template: Optional[str] = None, max_label_length: Optional[int] = None) -> Graph:
+        """
+        Builds the graph for a view of the resources
+        
+        Args:
+            filter_types: Filter expressions to include, e.g. 'aws_iam_*', 'module.network.**'
+                or 'tag:Env=prod' (None to include all)
+            group_by: Criterion for grouping resources ('vpc', 'type', 'module', a key of
+                PROVIDER_GROUPINGS such as 'resource-group', or None for no grouping)
+            exclude_types: Filter expressions to exclude (e.g., permissions, secrets)
+            nested_clusters: If True, creates nested clusters for related resources
+            focus: Address or glob of the resources to focus on (None to include the whole state);
+                the neighbourhood is walked only through resources kept by the filters
+            radius: Maximum number of hops from the focused resources
+            direction: Dependencies to follow from the focus ('up', 'down' or 'both')
+            module_depth: With group_by='module', modules nested deeper than this are
+                collapsed into summary nodes (None to expand every module)
+            label_template: Node label template with {name}, {type}, {friendly_type},
+                {address} and {module} fields (None for the default label of the grouping)
+            max_label_length: Maximum length of each label line, longer lines are truncated
+            
+        Returns:
+            The graph with its nodes, edges and clusters
+        """
+        if label_template:
+            check_label_template(label_template)
+        
+        # Apply inclusion and exclusion filters in a single pass, before the focus, so the
+        # result is the same as when the CLI filters while parsing
+        resources = ResourceFilter(filter_types, exclude_types).apply(self.resources)
+        dependencies = self.dependencies
+        
+        # Restrict to the focused neighbourhood of the kept resources before any node is created
+        if focus:
+            resources, dependencies = select_neighbourhood(resources, dependencies, focus, radius, direction)
+        filtered_resources = sorted(resources, key=lambda r: r['address'])
+        
+        self.graph = Graph({
+            'version': __version__,
+            'view': {
+                'filter_types': filter_types,
+                'exclude_types': exclude_types,
+                'group_by': group_by,
+                'nested_clusters': nested_clusters,
+                'focus': focus,
+                'radius': radius,
+                'direction': direction,
+                'module_depth': module_depth,
+                'label_template': label_template,
+                'max_label_length': max_label_length,
+            },
+        })
+        self.nodes = self.graph.nodes
+        self.aliases = {}
+        self.label_template = label_template
+        self.max_label_length = max_label_length
+        
+        # Create nodes for each resource according to the grouping type
+        if group_by == 'vpc':
+            if nested_clusters:
+                self._generate_nested_by_vpc(filtered_resources)
+            else:
+                self._generate_grouped_by_vpc(filtered_resources)
+        elif group_by == 'type':
+            if nested_clusters:
+                self._generate_nested_by_type(filtered_resources)
+            else:
+                self._generate_grouped_by_type(filtered_resources)
+        elif group_by == 'module':
+            self._generate_grouped_by_module(filtered_resources, module_depth)
+        elif group_by in PROVIDER_GROUPINGS:
+            self._generate_grouped_by_container(filtered_resources, PROVIDER_GROUPINGS[group_by],
+                                                nested_clusters)
+        else:
+            self._generate_flat(filtered_resources)
+        
+        # Connect nodes based on dependencies, redirecting collapsed resources to their summary node
+        for resource_id in sorted(dependencies):
+            target = self.aliases.get(resource_id, resource_id)
+            if target in self.nodes:
+                for dep in sorted(set(dependencies[resource_id])):
+                    self.graph.add_edge(self.aliases.get(dep, dep), target)
+        
+        return self.graph
+    
+    def _determine_subnet_type(self, resource: Dict[str, Any]) -> str:
+        """
+        Determines whether a subnet is public or private based on its attributes
+        
+        Args:
+            resource: Subnet-type resource
+            
+        Returns:
+            'public' or 'private'
+        """
+        name = resource.get('name', '').lower()
+        is_public = False
+        if 'values' in resource and isinstance(resource['values'], dict):
+            if resource['values'].get('map_public_ip_on_launch'):
+                is_public = True
+            tags = resource['values'].get('tags', {})
+            if isinstance(tags, dict):
+                subnet_type = tags.get('Type', '').lower()
+                if 'public' in subnet_type:
+                    is_public = True
+                elif 'private' in subnet_type:
+                    is_public = False
+        if 'public' in name:
+            is_public = True
+        elif 'private' in name:
+            is_public = False
+        return 'public' if is_public else 'private'
+    
+    def _create_node(self, resource: Dict[str, Any], label: str, cluster: Optional[str] = None) -> Node:
+        """
+        Adds the node of a resource to the given cluster, or the current one
+        
+        Args:
+            resource: Resource to represent
+            label: Default node label, used when there is no label template
+            cluster: Identifier of the cluster containing the node
+            
+        Returns:
+            The created node
+        """
+        return self.graph.add_node(resource['address'], self._format_label(resource, label), resource['type'],
+                                   cluster=cluster, name=resource['name'], **self._node_attributes(resource))
+    
+    def _format_label(self, resource: Dict[str, Any], label: str) -> str:
+        """
+        Applies the label template and truncation to a node label
+        
+        Labels are interned, as large states repeat the same names and types many times.
+        """
+        if self.label_template:
+            module_path = get_module_path(resource['address'])
+            label = self.label_template.format(
+                name=resource['name'],
+                type=resource['type'],
+                friendly_type=friendly_type_name(resource['type']),
+                address=resource['address'],
+                module=module_path[-1] if module_path else '',
+            )
+        
+        if self.max_label_length is not None:
+            label = '\n'.join(
+                line if len(line) <= self.max_label_length else line[:max(self.max_label_length - 1, 0)] + '…'
+                for line in label.split('\n')
+            )
+        return sys.intern(label)
+    
+    def _node_attributes(self, resource: Dict[str, Any]) -> Dict[str, Any]:
+        """Gets the renderer hints of a resource's node"""
+        # Special case for subnets
+        if resource['type'] == 'aws_subnet':
+            return {'subnet_type': self._determine_subnet_type(resource)}
+        return {}
+    
+    def _generate_flat(self, resources: List[Dict[str, Any]]):
+        """Generates a flat diagram without grouping"""
+        for resource in resources:
+            address = resource['address']
+            resource_type = resource['type']
+            name = resource['name']
+            
+            self._create_node(resource, f"{name}\n({resource_type})")
+    
+    def _generate_grouped_by_vpc(self, resources: List[Dict[str, Any]]):
+        """Generates a diagram grouped by VPC"""
+        # First identify all VPCs
+        vpcs = [r for r in resources if r['type'] == 'aws_vpc']
+        vpc_nodes = {}
+        
+        # Create clusters for each VPC
+        for vpc in vpcs:
+            vpc_address = vpc['address']
+            vpc_name = vpc.get('name', 'Unknown VPC')
+            
+            with self.graph.cluster(f"VPC: {vpc_name}"):
+                # Create node for VPC
+                vpc_node = self._create_node(vpc, f"{vpc_name}\n({vpc['type']})")
+                vpc_nodes[vpc_address] = vpc_node
+                
+                # Encontrar recursos que dependen de esta VPC
+                vpc_resources = []
+                for resource in resources:
+                    if resource['type'] != 'aws_vpc':
+                        # Verificar si el recurso tiene vpc_id en sus valores
+                        if 'values' in resource and isinstance(resource['values'], dict):
+                            vpc_id = resource['values'].get('vpc_id')
+                            # Buscar la VPC correspondiente
+                            for v in vpcs:
+                                if 'values' in v and v['values'].get('id') == vpc_id:
+                                    if v['address'] == vpc_address:
+                                        vpc_resources.append(resource)
+                                        break
+                
+                # Create nodes for the resources in this VPC
+                for resource in vpc_resources:
+                    address = resource['address']
+                    resource_type = resource['type']
+                    name = resource['name']
+                    
+                    self._create_node(resource, f"{name}\n({resource_type})")
+        
+        # Create nodes for resources that do not belong to any VPC
+        with self.graph.cluster("Global Resources"):
+            for resource in resources:
+                if resource['address'] not in self.nodes and resource['type'] != 'aws_vpc':
+                    address = resource['address']
+                    resource_type = resource['type']
+                    name = resource['name']
+                    
+                    self._create_node(resource, f"{name}\n({resource_type})")
+    
+    def _generate_grouped_by_container(self, resources: List[Dict[str, Any]], grouping: Dict[str, Any],
+                                       nested_clusters: bool = False):
+        """
+        Generates a diagram grouped by a provider-specific container
+        (resource group, GCP network, Kubernetes namespace), like the VPC grouping
+        
+        Args:
+            resources: Resources to include in the diagram
+            grouping: Grouping definition from PROVIDER_GROUPINGS
+            nested_clusters: If True, creates a sub-cluster per resource type in each container
+        """
+        containers = [r for r in resources if r['type'] in grouping['container_types']]
+        
+        # Index every identifier of each container so members are resolved in one lookup
+        container_by_key = {}
+        for container in containers:
+            values = container.get('values') or {}
+            for key in grouping['container_keys']:
+                identifier = get_value(values, key)
+                if isinstance(identifier, str) and identifier:
+                    container_by_key.setdefault(identifier, container['address'])
+        
+        members = {container['address']: [] for container in containers}
+        for resource in resources:
+            if resource['type'] in grouping['container_types']:
+                continue
+            values = resource.get('values')
+            if not isinstance(values, dict):
+                continue
+            for key in grouping['member_keys']:
+                reference = get_value(values, key)
+                if isinstance(reference, str) and reference in container_by_key:
+                    members[container_by_key[reference]].append(resource)
+                    break
+        
+        for container in containers:
+            container_name = container.get('name', f"Unknown {grouping['label']}")
+            
+            with self.graph.cluster(f"{grouping['label']}: {container_name}"):
+                self._create_node(container, f"{container_name}\n({container['type']})")
+                
+                container_resources = members[container['address']]
+                if nested_clusters:
+                    resource_by_type = {}
+                    for resource in container_resources:
+                        resource_by_type.setdefault(resource['type'], []).append(resource)
+                    
+                    for resource_type, type_resources in resource_by_type.items():
+                        with self.graph.cluster(friendly_type_name(resource_type)):
+                            for resource in type_resources:
+                                self._process_resource_node(resource)
+                else:
+                    for resource in container_resources:
+                        self._create_node(resource, f"{resource['name']}\n({resource['type']})")
+        
+        # Create nodes for resources that do not belong to any container
+        with self.graph.cluster("Global Resources"):
+            for resource in resources:
+                if resource['address'] not in self.nodes:
+                    self._create_node(resource, f"{resource['name']}\n({resource['type']})")
+    
+    def _generate_grouped_by_module(self, resources: List[Dict[str, Any]], max_depth: Optional[int] = None):
+        """
+        Generates a diagram with nested clusters following the module tree
+        
+        Args:
+            resources: Resources to include in the diagram
+            max_depth: Number of module levels drawn as clusters; deeper modules are
+                collapsed into one summary node each (None for no limit)
+        """
+        module_clusters = {}
+        
+        def get_cluster(path: List[str]) -> Optional[str]:
+            # Create the clusters of the path top-down, reusing existing ones
+            parent = None
+            for module_address in path:
+                if module_address not in module_clusters:
+                    label = f"Module: {module_address.rsplit('module.', 1)[-1]}"
+                    module_clusters[module_address] = self.graph.add_cluster(label, parent=parent).id
+                parent = module_clusters[module_address]
+            return parent
+        
+        collapsed = {}
+        for resource in resources:
+            path = get_module_path(resource['address'])
+            if max_depth is not None and len(path) > max_depth:
+                # Collapse everything below the depth limit into its module at max_depth + 1
+                summary = path[max_depth]
+                collapsed.setdefault(summary, (path[:max_depth], []))[1].append(resource)
+                self.aliases[resource['address']] = summary
+                continue
+            
+            cluster = get_cluster(path)
+            self._create_node(resource, f"{resource['name']}\n({resource['type']})", cluster)
+        
+        for summary, (parent_path, module_resources) in collapsed.items():
+            cluster = get_cluster(parent_path)
+            name = summary.rsplit('module.', 1)[-1]
+            count = len(module_resources)
+            self.graph.add_node(summary, f"{name}\n({count} {'resource' if count == 1 else 'resources'})", 'module',
+                                cluster=cluster, name=name, collapsed=True, resource_count=count)
+    
+    def _generate_grouped_by_type(self, resources: List[Dict[str, Any]]):
+        """Generates a diagram grouping resources by type"""
+        # grouping resources bt type
+        resource_types = {}
+        for resource in resources:
+            resource_type = resource['type']
+            if resource_type not in resource_types:
+                resource_types[resource_type] = []
+            resource_types[resource_type].append(resource)
+        
+        # Crear clusters para cada tipo de recurso
+        for resource_type, type_resources in resource_types.items():
+            # Obtener un nombre más amigable para el tipo
+            friendly_name = friendly_type_name(resource_type)
+            
+            with self.graph.cluster(f"{friendly_name}"):
+                for resource in type_resources:
+                    address = resource['address']
+                    name = resource['name']
+                    
+                    self._create_node(resource, f"{name}")
+
+    def _generate_nested_by_vpc(self, resources: List[Dict[str, Any]]):
+        """Genera un diagrama con clusters anidados agrupados por VPC"""
+        # Primero identificar todas las VPCs
+        vpcs = [r for r in resources if r['type'] == 'aws_vpc']
+        vpc_nodes = {}
+        
+        # Crear clusters para cada VPC
+        for vpc in vpcs:
+            vpc_address = vpc['address']
+            vpc_name = vpc.get('name', 'Unknown VPC')
+            
+            with self.graph.cluster(f"VPC: {vpc_name}"):
+                # Crear nodo para la VPC
+                vpc_node = self._create_node(vpc, f"{vpc_name}\n({vpc['type']})")
+                vpc_nodes[vpc_address] = vpc_node
+                
+                # Encontrar recursos que dependen de esta VPC
+                vpc_resources = []
+                for resource in resources:
+                    if resource['type'] != 'aws_vpc':
+                        # Verificar si el recurso tiene vpc_id en sus valores
+                        if 'values' in resource and isinstance(resource['values'], dict):
+                            vpc_id = resource['values'].get('vpc_id')
+                            # Buscar la VPC correspondiente
+                            for v in vpcs:
+                                if 'values' in v and v['values'].get('id') == vpc_id:
+                                    if v['address'] == vpc_address:
+                                        vpc_resources.append(resource)
+                                        break
+                
+                # Agrupar recursos por tipo dentro de la VPC
+                resource_by_type = {}
+                for resource in vpc_resources:
+                    resource_type = resource['type']
+                    if resource_type not in resource_by_type:
+                        resource_by_type[resource_type] = []
+                    resource_by_type[resource_type].append(resource)
+                
+                # Crear clusters anidados para cada tipo de recurso
+                for resource_type, type_resources in resource_by_type.items():
+                    # Obtener un nombre más amigable para el tipo
+                    friendly_name = friendly_type_name(resource_type)
+                    
+                    # Crear cluster para el tipo de recurso
+                    with self.graph.cluster(f"{friendly_name}"):
+                        for resource in type_resources:
+                            address = resource['address']
+                            name = resource['name']
+                            
+                            self._create_node(resource, f"{name}")
+                            
+                            # Crear clusters anidados para recursos que tienen dependencias específicas
+                            if resource_type in ['aws_ecs_cluster', 'aws_eks_cluster', 'aws_rds_cluster']:
+                                self._create_nested_dependencies(resource, resources)
+        
+        # Crear nodos para recursos que no pertenecen a ninguna VPC
+        with self.graph.cluster("Recursos Globales"):
+            global_resources = [r for r in resources if r['address'] not in self.nodes and r['type'] != 'aws_vpc']
+            
+            # Agrupar recursos globales por tipo
+            global_by_type = {}
+            for resource in global_resources:
+                resource_type = resource['type']
+                if resource_type not in global_by_type:
+                    global_by_type[resource_type] = []
+                global_by_type[resource_type].append(resource)
+            
+            # Crear clusters anidados para cada tipo de recurso global
+            for resource_type, type_resources in global_by_type.items():
+                friendly_name = friendly_type_name(resource_type)
+                
+                with self.graph.cluster(f"{friendly_name}"):
+                    for resource in type_resources:
+                        address = resource['address']
+                        name = resource['name']
+                        
+                        self._create_node(resource, f"{name}")
+                        
+                        # Crear clusters anidados para recursos que tienen dependencias específicas
+                        if resource_type in ['aws_ecs_cluster', 'aws_eks_cluster', 'aws_rds_cluster']:
+                            self._create_nested_dependencies(resource, resources)
+
+    def _generate_nested_by_type(self, resources: List[Dict[str, Any]]):
+        """Genera un diagrama con clusters anidados agrupados por tipo"""
+        # Agrupar recursos por tipo
+        resource_types = {}
+        for resource in resources:
+            resource_type = resource['type']
+            if resource_type not in resource_types:
+                resource_types[resource_type] = []
+            resource_types[resource_type].append(resource)
+        
+        # Crear clusters para cada tipo de recurso
+        for resource_type, type_resources in resource_types.items():
+            # Obtener un nombre más amigable para el tipo
+            friendly_name = friendly_type_name(resource_type)
+            
+            with self.graph.cluster(f"{friendly_name}"):
+                for resource in type_resources:
+                    address = resource['address']
+                    name = resource['name']
+                    
+                    self._create_node(resource, f"{name}")
+                    
+                    # Crear clusters anidados para recursos que tienen dependencias específicas
+                    if resource_type in ['aws_ecs_cluster', 'aws_eks_cluster', 'aws_rds_cluster']:
+                        self._create_nested_dependencies(resource, resources)
+
+    def _create_nested_dependencies(self, parent_resource: Dict[str, Any], all_resources: List[Dict[str, Any]], depth: int = 0, max_depth: int = 3, processed_resources: set[str] = None):
+        """Crea un cluster anidado para los recursos que dependen del recurso padre de manera recursiva"""
+        # Inicializar el conjunto de recursos procesados si es None
+        if processed_resources is None:
+            processed_resources = set()
+            
+        # Evitar recursión infinita o demasiado profunda
+        if depth >= max_depth:
+            return
+            
+        parent_address = parent_resource['address']
+        parent_name = parent_resource['name']
+        parent_type = parent_resource['type']
+        
+        # Evitar procesar el mismo recurso más de una vez
+        if parent_address in processed_resources:
+            return
+            
+        processed_resources.add(parent_address)
+        
+        # Encontrar recursos que dependen de este recurso padre
+        dependent_resources = []
+        
+        # Buscar por ID en los valores
+        parent_id = None
+        if 'values' in parent_resource and isinstance(parent_resource['values'], dict):
+            parent_id = parent_resource['values'].get('id')
+        
+        if parent_id:
+            for resource in all_resources:
+                if resource['address'] != parent_address and resource['address'] not in processed_resources:  # Evitar el propio recurso y recursos ya procesados
+                    if 'values' in resource and isinstance(resource['values'], dict):
+                        # Buscar referencias al ID del padre en los valores
+                        for key, value in resource['values'].items():
+                            if isinstance(value, str) and parent_id in value:
+                                dependent_resources.append(resource)
+                                break
+                            elif isinstance(value, dict):
+                                for k, v in value.items():
+                                    if isinstance(v, str) and parent_id in v:
+                                        dependent_resources.append(resource)
+                                        break
+        
+        # Si encontramos recursos dependientes, crear un cluster anidado
+        if dependent_resources:
+            # Determinar un nombre apropiado para el cluster
+            if parent_type == 'aws_ecs_cluster':
+                cluster_name = f"ECS Cluster: {parent_name}"
+            elif parent_type == 'aws_eks_cluster':
+                cluster_name = f"EKS Cluster: {parent_name}"
+            elif parent_type == 'aws_rds_cluster':
+                cluster_name = f"RDS Cluster: {parent_name}"
+            elif parent_type == 'aws_autoscaling_group':
+                cluster_name = f"ASG: {parent_name}"
+            elif parent_type == 'aws_lb' or parent_type == 'aws_alb' or parent_type == 'aws_elb':
+                cluster_name = f"Load Balancer: {parent_name}"
+            else:
+                cluster_name = f"Dependencias de {parent_name}"
+            
+            # Crear un cluster para los recursos dependientes
+            with self.graph.cluster(cluster_name):
+                # Agrupar recursos dependientes por tipo para mejor organización
+                dependent_by_type = {}
+                for resource in dependent_resources:
+                    resource_type = resource['type']
+                    if resource_type not in dependent_by_type:
+                        dependent_by_type[resource_type] = []
+                    dependent_by_type[resource_type].append(resource)
+                
+                # Si hay múltiples tipos, crear subclusters por tipo
+                if len(dependent_by_type) > 1:
+                    for resource_type, type_resources in dependent_by_type.items():
+                        friendly_name = friendly_type_name(resource_type)
+                        
+                        with self.graph.cluster(f"{friendly_name}"):
+                            for resource in type_resources:
+                                self._process_resource_node(resource)
+                                # Llamada recursiva para crear clusters anidados más profundos
+                                if resource['type'] in ['aws_ecs_cluster', 'aws_eks_cluster', 'aws_rds_cluster', 'aws_autoscaling_group', 'aws_lb', 'aws_alb', 'aws_elb']:
+                                    self._create_nested_dependencies(resource, all_resources, depth + 1, max_depth, processed_resources)
+                else:
+                    # Si solo hay un tipo, no crear subcluster adicional
+                    for resource in dependent_resources:
+                        self._process_resource_node(resource)
+                        # Llamada recursiva para crear clusters anidados más profundos
+                        if resource['type'] in ['aws_ecs_cluster', 'aws_eks_cluster', 'aws_rds_cluster', 'aws_autoscaling_group', 'aws_lb', 'aws_alb', 'aws_elb']:
+                            self._create_nested_dependencies(resource, all_resources, depth + 1, max_depth, processed_resources)
+    
+    def _process_resource_node(self, resource):
+        """Processes a resource and creates its corresponding node"""
+        address = resource['address']
+        name = resource['name']
+        resource_type = resource['type']
+        
+        # Evitar crear nodos duplicados
+        if address not in self.nodes:
+            self._create_node(resource, f"{name}")
+
+
+def build_graph(resources: List[Dict[str, Any]], dependencies: Dict[str, List[str]], **view_options: Any) -> Graph:
+    """
+    Builds the graph of a view of the resources
+    
+    Args:
+        resources: List of resources extracted from the state
+        dependencies: Dictionary of resource dependencies
+        **view_options: Options accepted by GraphBuilder.build()
+        
+    Returns:
+        The built graph
+    """
+    return GraphBuilder(resources, dependencies).build(**view_options)
+
+
+def load_graph(state_file: str, infer_dependencies: bool = False, **view_options: Any) -> Graph:
+    """
+    Parses a Terraform state file and builds the graph of a view of it
+    
+    Args:
+        state_file: Path to the Terraform state file
+        infer_dependencies: If True, adds dependencies inferred from attribute references
+        **view_options: Options accepted by GraphBuilder.build()
+        
+    Returns:
+        The built graph
+    """
+    parser = TerraformStateParser(state_file)
+    resources, dependencies = parser.parse()
+    if infer_dependencies:
+        dependencies = parser.infer_dependencies()
+    return build_graph(resources, dependencies, **view_options)
@@ -2,9 +2,17 @@
 Command-line interface for DiagraForm
 """
 import click
+import json
 import os
-from .parser import TerraformStateParser
+from collections import Counter
+from .parser import TerraformStateParser, infer_dependencies as infer_reference_dependencies
 from .generator import DiagramGenerator
+from .builder import check_label_template
+from .estimate import DEFAULT_BUDGET, recommend_view
+from .filters import ResourceFilter
+from .providers import PROVIDER_GROUPINGS
+from .query import match_addresses
+from .workspaces import get_workspace_names, parse_state_files
 
 
 @click.group()
@@ -13,69 +21,186 @@ def cli():
     pass
 
 
+def view_options(command):
+    """Adds the options selecting the view of the resources, shared by generate and analyze"""
+    options = [
+        click.option('--filter', '-t', multiple=True,
+                     help='Include resources matching a type glob, module path, tag:Key=Value or !negation '
+                          '(can be specified multiple times)'),
+        click.option('--exclude', '-e', multiple=True,
+                     help='Exclude resources matching a type glob, module path, tag:Key=Value or !negation '
+                          '(can be specified multiple times)'),
+        click.option('--group-by', '-g', type=click.Choice(['vpc', 'type', 'module', *PROVIDER_GROUPINGS, 'none']),
+                     default='none',
+                     help='Group resources by VPC, type, module, Azure resource group, GCP network, '
+                          'Kubernetes namespace, or none'),
+        click.option('--module-depth', type=click.IntRange(min=0),
+                     help='With --group-by module, collapse modules nested deeper than this into summary nodes'),
+        click.option('--nested/--no-nested', default=False, help='Create nested clusters for related resources'),
+        click.option('--infer-dependencies/--no-infer-dependencies', default=False,
+                     help='Infer dependencies from *_id and *_arn attribute references'),
+        click.option('--focus', help='Only draw the resources around this address or glob (e.g. module.api.aws_lb.*)'),
+        click.option('--radius', type=click.IntRange(min=0), default=1,
+                     help='Maximum number of hops from the focused resources'),
+        click.option('--direction', type=click.Choice(['up', 'down', 'both']), default='both',
+                     help='Follow dependencies (up), dependents (down), or both from the focused resources'),
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+
+def parse_states(state_files, include, exclude, jobs):
+    """
+    Parses one state file, or several concurrently merged into one estate (addresses
+    namespaced by workspace), applying the filters while parsing
+    """
+    if len(state_files) == 1:
+        resource_filter = ResourceFilter(include, exclude)
+        parser = TerraformStateParser(state_files[0])
+        return parser.parse(resource_filter if resource_filter else None)
+    return parse_state_files(list(state_files), list(include), list(exclude), jobs)
+
+
+def echo_state_files(state_files):
+    """Prints the state files being analyzed, with their workspace names when there are several"""
+    if len(state_files) == 1:
+        click.echo(f"Analyzing state file: {state_files[0]}")
+        return
+    for workspace, state_file in get_workspace_names(list(state_files)).items():
+        click.echo(f"Analyzing state file: {state_file} (workspace: {workspace})")
+
+
+def check_focus(resources, focus):
+    """Fails when the --focus pattern matches none of the resources, which would draw an empty diagram"""
+    if not match_addresses(resources, focus):
+        raise click.UsageError(f"--focus '{focus}' does not match any resource address")
+
+
+def parse_label_template(ctx, param, value):
+    """Validates the --label-template option, allowing line breaks to be written as \\n"""
+    if value is None:
+        return None
+    template = value.replace('\\n', '\n')
+    try:
+        check_label_template(template)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+    return template
+
+
 @cli.command()
-@click.argument('state_file', type=click.Path(exists=True))
+@click.argument('state_files', nargs=-1, required=True, type=click.Path(exists=True))
 @click.option('--output', '-o', default='./diagrams', help='Output directory for the diagram')
 @click.option('--filename', '-f', default='terraform_diagram', help='Filename (without extension)')
 @click.option('--show/--no-show', default=True, help='Open the diagram after generation')
-@click.option('--filter', '-t', multiple=True, help='Filter by resource types (can be specified multiple times)')
-@click.option('--exclude', '-e', multiple=True, help='Exclude resource types (can be specified multiple times)')
-@click.option('--group-by', '-g', type=click.Choice(['vpc', 'type', 'none']), default='none', 
-              help='Group resources by VPC, type, or none')
-@click.option('--nested/--no-nested', default=False, help='Create nested clusters for related resources')
-def generate(state_file, output, filename, show, filter, exclude, group_by, nested):
-    """Generates a diagram from a Terraform state file"""
-    click.echo(f"Analyzing state file: {state_file}")
-    
-    parser = TerraformStateParser(state_file)
-    resources, dependencies = parser.parse()
+@view_options
+@click.option('--force', is_flag=True, help='Render even if the existing diagram is up to date')
+@click.option('--label-template', callback=parse_label_template,
+              help='Node label template with {name}, {type}, {friendly_type}, {address} and {module} fields '
+                   '(use \\n for line breaks)')
+@click.option('--max-label-length', type=click.IntRange(min=1), help='Truncate label lines longer than this')
+@click.option('--jobs', '-j', type=click.IntRange(min=1),
+              help='Worker processes used to parse several state files (default: CPU count)')
+def generate(state_files, output, filename, show, filter, exclude, group_by, module_depth, nested,
+             infer_dependencies, focus, radius, direction, force, label_template, max_label_length, jobs):
+    """Generates a diagram from one or more Terraform state files"""
+    if filter:
+        click.echo(f"Filtering by: {', '.join(filter)}")
+    
+    if exclude:
+        click.echo(f"Excluding: {', '.join(exclude)}")
+    
+    echo_state_files(state_files)
+    resources, dependencies = parse_states(state_files, filter, exclude, jobs)
+    if infer_dependencies:
+        dependencies = infer_reference_dependencies(resources, dependencies)
     
     click.echo(f"Found {len(resources)} resources and {sum(len(deps) for deps in dependencies.values())} dependencies")
     
     # Convert 'none' to None for grouping
     group_by_value = None if group_by == 'none' else group_by
     
-    # Convert tuples to lists or None if empty
-    filter_list = list(filter) if filter else None
-    exclude_list = list(exclude) if exclude else None
-    
-    if filter_list:
-        click.echo(f"Filtering by resource types: {', '.join(filter_list)}")
-    
-    if exclude_list:
-        click.echo(f"Excluding resource types: {', '.join(exclude_list)}")
-    
     if group_by_value:
         click.echo(f"Grouping resources by: {group_by_value}")
     
+    if group_by_value == 'module' and module_depth is not None:
+        click.echo(f"Collapsing modules deeper than {module_depth} levels")
+    
     if nested:
         click.echo("Creating nested clusters for related resources")
     
+    if focus:
+        check_focus(resources, focus)
+        click.echo(f"Focusing on {focus} (radius: {radius}, direction: {direction})")
+    
     click.echo(f"Generating diagram at: {output}/{filename}.png")
     generator = DiagramGenerator(resources, dependencies)
-    generator.generate(output, filename, show, filter_list, group_by_value, exclude_list, nested)
+    rendered = generator.generate(output, filename, show, None, group_by_value, None, nested,
+                                  focus, radius, direction, force, module_depth,
+                                  label_template, max_label_length)
     
-    click.echo("Diagram generated successfully!")
+    if rendered:
+        click.echo("Diagram generated successfully!")
+    else:
+        click.echo("Diagram is up to date, skipping rendering (use --force to render anyway)")
 
 
 @cli.command()
-@click.argument('state_file', type=click.Path(exists=True))
-def analyze(state_file):
-    """Analyzes a Terraform state file and displays statistics"""
-    click.echo(f"Analyzing state file: {state_file}")
+@click.argument('state_files', nargs=-1, required=True, type=click.Path(exists=True))
+@view_options
+@click.option('--estimate', is_flag=True,
+              help='Estimate the render time of the view and recommend a cheaper one when it is too slow')
+@click.option('--budget', type=click.FloatRange(min=0), default=DEFAULT_BUDGET, show_default=True,
+              help='With --estimate, render time in seconds above which cheaper views are recommended')
+@click.option('--json', 'as_json', is_flag=True, help='With --estimate, print the estimate as JSON')
+@click.option('--jobs', '-j', type=click.IntRange(min=1),
+              help='Worker processes used to parse several state files (default: CPU count)')
+def analyze(state_files, filter, exclude, group_by, module_depth, nested, infer_dependencies, focus, radius,
+            direction, estimate, budget, as_json, jobs):
+    """Analyzes one or more Terraform state files and displays statistics"""
+    resources, dependencies = parse_states(state_files, filter, exclude, jobs)
+    if infer_dependencies:
+        dependencies = infer_reference_dependencies(resources, dependencies)
     
-    parser = TerraformStateParser(state_file)
-    resources, dependencies = parser.parse()
+    if focus:
+        check_focus(resources, focus)
     
+    if estimate:
+        result = recommend_view(resources, dependencies, budget,
+                                group_by=None if group_by == 'none' else group_by, nested_clusters=nested,
+                                focus=focus, radius=radius, direction=direction, module_depth=module_depth)
+        if as_json:
+            click.echo(json.dumps(result, indent=2))
+            return
+    
+    echo_state_files(state_files)
     click.echo(f"Total resources: {len(resources)}")
     
-    resource_types = parser.get_resource_types()
+    # Count the parsed resources, as the parser's accessors would parse the unfiltered state again
+    type_counts = Counter(resource['type'] for resource in resources)
     click.echo("\nResource types found:")
-    for rt in sorted(resource_types):
-        count = len(parser.get_resources_by_type(rt))
-        click.echo(f"  - {rt}: {count}")
+    for rt in sorted(type_counts):
+        click.echo(f"  - {rt}: {type_counts[rt]}")
     
     click.echo(f"\nTotal dependencies: {sum(len(deps) for deps in dependencies.values())}")
+    
+    if estimate:
+        click.echo(f"\nRender estimate: {result['nodes']} nodes, {result['edges']} edges, "
+                   f"{result['clusters']} clusters (depth {result['cluster_depth']})")
+        click.echo(f"  ~{result['estimated_seconds']}s on a {result['runner']} runner")
+        if result['recommendations']:
+            click.echo(f"\nRecommended views (budget: {budget:g}s):")
+        for recommendation in result['recommendations']:
+            if recommendation['view'] == 'collapse':
+                options = recommendation['options']
+                click.echo(f"  - collapse: --group-by module --module-depth {options['module_depth']} "
+                           f"(~{recommendation['estimated_seconds']}s, {recommendation['runner']} runner)")
+            else:
+                shards = ', '.join(f"'{expression}'" for expression in recommendation['shards'])
+                click.echo(f"  - shard: {len(recommendation['shards'])} diagrams "
+                           f"(up to ~{recommendation['estimated_seconds']}s each, {recommendation['runner']} runner), "
+                           f"one per --filter {shards}")
 
 
 def main():
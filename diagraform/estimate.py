@@ -0,0 +1,173 @@
+"""
+Module for estimating the cost of rendering a graph before invoking Graphviz
+
+The estimate is a simple cost model over the size of the graph that would be
+rendered: a fixed start-up cost, a per-node cost (icon loading and drawing), a
+per-edge cost, a per-cluster cost that grows with nesting, and a layout term
+that grows with the square of the graph size (dot's crossing minimization and
+the orthogonal edge routing used by diagrams dominate large graphs).
+"""
+from typing import Dict, List, Any, Optional
+
+from .builder import build_graph
+from .model import Graph
+from .parser import get_module_path
+
+# Seconds per unit of each term of the cost model. These are uncalibrated
+# placeholder values, not measurements: pass a cost model to estimate_render()
+# with coefficients fitted to renders timed on your runners.
+RENDER_COST_MODEL = {
+    'base': 0.5,
+    'node': 0.002,
+    'edge': 0.001,
+    'cluster': 0.01,
+    'layout': 2e-7,
+}
+
+# Runner size for each maximum estimated render time, in seconds
+RUNNER_CLASSES = [
+    (30, 'small'),
+    (300, 'medium'),
+    (1800, 'large'),
+]
+
+# Render time above which a cheaper view is recommended, in seconds
+DEFAULT_BUDGET = 60
+
+
+def estimate_render(graph: Graph, cost_model: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """
+    Estimates the time needed to render a graph
+    
+    Args:
+        graph: Graph that would be rendered
+        cost_model: Coefficients of the cost model (defaults to RENDER_COST_MODEL)
+    
+    Returns:
+        Dictionary with the node, edge and cluster counts, the cluster nesting depth,
+        the estimated render time in seconds, the share of it spent on layout and
+        the runner size class
+    """
+    model = {**RENDER_COST_MODEL, **(cost_model or {})}
+    nodes = len(graph.nodes)
+    edges = len(graph.edges)
+    clusters = len(graph.clusters)
+    depth = graph.cluster_depth()
+    
+    layout = model['layout'] * (nodes + edges) ** 2
+    seconds = (model['base'] + model['node'] * nodes + model['edge'] * edges
+               + model['cluster'] * clusters * max(depth, 1) + layout)
+    
+    return {
+        'nodes': nodes,
+        'edges': edges,
+        'clusters': clusters,
+        'cluster_depth': depth,
+        'estimated_seconds': round(seconds, 2),
+        'layout_share': round(layout / seconds if seconds else 0.0, 2),
+        'runner': get_runner_class(seconds),
+    }
+
+
+def get_runner_class(seconds: float) -> str:
+    """
+    Gets the runner size class for an estimated render time
+    
+    Args:
+        seconds: Estimated render time in seconds
+    
+    Returns:
+        Name of the smallest runner class able to render in that time ('xlarge' if none)
+    """
+    for limit, runner in RUNNER_CLASSES:
+        if seconds <= limit:
+            return runner
+    return 'xlarge'
+
+
+def get_shards(resources: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Splits resources into independently renderable shards
+    
+    Resources merged from several states are split by workspace; otherwise they
+    are split by top-level module, with the root module resources in a shard of their own.
+    
+    Args:
+        resources: Resources to split
+    
+    Returns:
+        Dictionary of shard filter expression (usable with --filter) -> resources of the shard
+    """
+    workspaces = {r['workspace'] for r in resources if r.get('workspace')}
+    shards = {}
+    for resource in resources:
+        if len(workspaces) > 1:
+            key = f"workspace:{resource['workspace']}"
+        else:
+            path = get_module_path(resource['address'])
+            key = f"{path[0]}.**" if path else '!module.**'
+        shards.setdefault(key, []).append(resource)
+    return shards
+
+
+def recommend_view(resources: List[Dict[str, Any]], dependencies: Dict[str, List[str]],
+                   budget: float = DEFAULT_BUDGET, cost_model: Optional[Dict[str, float]] = None,
+                   **view_options: Any) -> Dict[str, Any]:
+    """
+    Estimates the render time of a view and recommends cheaper views when it exceeds a budget
+    
+    The graph of the view (and of every candidate view) is built without rendering,
+    so this is cheap compared to an actual render.
+    
+    Args:
+        resources: List of resources extracted from the state
+        dependencies: Dictionary of resource dependencies
+        budget: Render time in seconds above which cheaper views are recommended
+        cost_model: Coefficients of the cost model (defaults to RENDER_COST_MODEL)
+        **view_options: Options accepted by GraphBuilder.build()
+    
+    Returns:
+        The estimate of the view (see estimate_render()) with a 'recommendations' list;
+        each recommendation has a 'view' ('collapse' or 'shard'), the view 'options'
+        to use and the resulting 'estimated_seconds' and 'runner' (of the slowest shard,
+        whose --filter expressions are listed in 'shards')
+    """
+    graph = build_graph(resources, dependencies, **view_options)
+    estimate = estimate_render(graph, cost_model)
+    recommendations = []
+    estimate['recommendations'] = recommendations
+    if estimate['estimated_seconds'] <= budget:
+        return estimate
+    
+    # Collapse modules into summary nodes, stopping at the least collapsed view that fits the budget
+    if any(get_module_path(address) for address in graph.nodes):
+        current_depth = view_options.get('module_depth')
+        for depth in (2, 1, 0):
+            if view_options.get('group_by') == 'module' and current_depth is not None and depth >= current_depth:
+                continue
+            options = {'group_by': 'module', 'module_depth': depth}
+            collapsed = estimate_render(build_graph(resources, dependencies, **{**view_options, **options}),
+                                        cost_model)
+            if collapsed['nodes'] >= estimate['nodes']:
+                continue
+            recommendations.append({'view': 'collapse', 'options': options,
+                                    'estimated_seconds': collapsed['estimated_seconds'],
+                                    'runner': collapsed['runner']})
+            if collapsed['estimated_seconds'] <= budget:
+                break
+    
+    # Render one diagram per workspace or top-level module; shards can run in parallel
+    shards = get_shards(resources)
+    if len(shards) > 1:
+        shard_estimates = {
+            expression: estimate_render(build_graph(shard, dependencies, **view_options), cost_model)
+            for expression, shard in shards.items()
+        }
+        # Shards left empty by the view's filters are not worth rendering
+        shard_estimates = {k: e for k, e in shard_estimates.items() if e['nodes']}
+        if len(shard_estimates) > 1:
+            slowest = max(e['estimated_seconds'] for e in shard_estimates.values())
+            recommendations.append({'view': 'shard', 'options': {}, 'shards': list(shard_estimates),
+                                    'estimated_seconds': slowest, 'runner': get_runner_class(slowest)})
+    
+    return estimate
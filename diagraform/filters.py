@@ -0,0 +1,192 @@
+"""
+Module for compiling resource filter expressions
+
+A filter expression is one of:
+    aws_iam_*            resource type glob (an exact type still works)
+    module.network.**    address glob ('*' stays within one segment, '**' spans any)
+    tag:Env=prod         tag match (the value is a glob; 'tag:Env' checks the key only)
+    workspace:network    workspace glob, for resources merged from several states
+    !<expression>        negation of any of the above
+
+Resources merged from several states are matched by address globs without their
+'<workspace>::' prefix, unless the glob has one itself (e.g. 'network::module.vpc.**').
+"""
+import re
+from fnmatch import translate
+from typing import Callable, Dict, Iterable, List, Any, Optional
+from .parser import WORKSPACE_SEPARATOR
+
+Predicate = Callable[[Dict[str, Any]], bool]
+
+
+def _compile_address_glob(pattern: str) -> re.Pattern:
+    """
+    Translates an address glob into a regular expression
+    
+    A literal segment also matches its count/for_each instances, so 'module.network.**'
+    matches 'module.network[0].aws_vpc.main' and 'aws_instance.web' matches 'aws_instance.web["a"]'.
+    """
+    optional_index = r'(?:\[[^\]]*\])?'
+    parts = []
+    i = 0
+    while i < len(pattern):
+        if pattern[i] == '.' and i and pattern[i - 1] not in '*]':
+            parts.append(optional_index + r'\.')
+            i += 1
+        elif pattern.startswith('**', i):
+            parts.append('.*')
+            i += 2
+        elif pattern[i] == '*':
+            parts.append(r'[^.]*')
+            i += 1
+        elif pattern[i] == '?':
+            parts.append(r'[^.]')
+            i += 1
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    if pattern[-1] not in '*]':
+        parts.append(optional_index)
+    return re.compile(''.join(parts) + r'\Z')
+
+
+def _local_address(resource: Dict[str, Any]) -> str:
+    """Gets the address of a resource without the workspace prefix of merged states"""
+    address = resource['address']
+    workspace = resource.get('workspace')
+    if workspace and address.startswith(workspace + WORKSPACE_SEPARATOR):
+        return address[len(workspace) + len(WORKSPACE_SEPARATOR):]
+    return address
+
+
+def _qualified_address(resource: Dict[str, Any]) -> str:
+    """Gets the address of a resource with its workspace prefix, which is not added yet while parsing"""
+    workspace = resource.get('workspace')
+    address = _local_address(resource)
+    return f"{workspace}{WORKSPACE_SEPARATOR}{address}" if workspace else address
+
+
+def compile_address_pattern(pattern: str) -> Predicate:
+    """
+    Compiles an address glob into a predicate over resources
+    
+    Shared by address filter expressions and --focus, so both use the same glob language.
+    Merged resources are matched without their workspace prefix, unless the pattern has one.
+    
+    Args:
+        pattern: Address glob, e.g. 'module.network.**' or 'module.api.aws_lb.*'
+        
+    Returns:
+        Function returning True for the resources whose address matches the glob
+    """
+    address_regex = _compile_address_glob(pattern)
+    if WORKSPACE_SEPARATOR in pattern:
+        return lambda resource: address_regex.match(_qualified_address(resource)) is not None
+    return lambda resource: address_regex.match(_local_address(resource)) is not None
+
+
+def _get_tags(resource: Dict[str, Any]) -> Dict[str, Any]:
+    """Gets the tags of a resource, falling back to tags_all"""
+    values = resource.get('values')
+    if not isinstance(values, dict):
+        return {}
+    tags = values.get('tags') or values.get('tags_all')
+    return tags if isinstance(tags, dict) else {}
+
+
+def compile_expression(expression: str) -> Predicate:
+    """
+    Compiles a single filter expression into a predicate over resources
+    
+    Args:
+        expression: Filter expression (see the module documentation)
+        
+    Returns:
+        Function returning True for the resources matched by the expression
+    """
+    if expression.startswith('!'):
+        inner = compile_expression(expression[1:])
+        return lambda resource: not inner(resource)
+    
+    if expression.startswith('tag:'):
+        key, has_value, value = expression[4:].partition('=')
+        if not has_value:
+            return lambda resource: key in _get_tags(resource)
+        value_regex = re.compile(translate(value))
+        
+        def match_tag(resource: Dict[str, Any]) -> bool:
+            tags = _get_tags(resource)
+            return key in tags and value_regex.match(str(tags[key])) is not None
+        return match_tag
+    
+    if expression.startswith('workspace:'):
+        workspace_regex = re.compile(translate(expression[10:]))
+        return lambda resource: workspace_regex.match(resource.get('workspace') or '') is not None
+    
+    if '.' in expression or WORKSPACE_SEPARATOR in expression:
+        return compile_address_pattern(expression)
+    
+    if not any(c in expression for c in '*?['):
+        return lambda resource: resource['type'] == expression
+    type_regex = re.compile(translate(expression))
+    return lambda resource: type_regex.match(resource['type']) is not None
+
+
+class ResourceFilter:
+    """Include/exclude filter compiled once and evaluated in a single pass"""
+    
+    def __init__(self, include: Optional[Iterable[str]] = None, exclude: Optional[Iterable[str]] = None):
+        """
+        Compiles the include and exclude expressions
+        
+        Args:
+            include: Expressions of which at least one must match (None to include all)
+            exclude: Expressions of which none may match (None to exclude nothing)
+        """
+        self.include = list(include or [])
+        self.exclude = list(exclude or [])
+        
+        # Plain resource types are the common case: check them with a set lookup
+        self._include_types = {e for e in self.include if self._is_plain_type(e)}
+        self._exclude_types = {e for e in self.exclude if self._is_plain_type(e)}
+        self._include = [compile_expression(e) for e in self.include if e not in self._include_types]
+        self._exclude = [compile_expression(e) for e in self.exclude if e not in self._exclude_types]
+    
+    @staticmethod
+    def _is_plain_type(expression: str) -> bool:
+        """Checks whether an expression is an exact resource type"""
+        return not any(c in expression for c in '!:.*?[')
+    
+    def __bool__(self) -> bool:
+        return bool(self.include or self.exclude)
+    
+    def __call__(self, resource: Dict[str, Any]) -> bool:
+        """
+        Evaluates the filter against a resource
+        
+        Args:
+            resource: Resource to check
+            
+        Returns:
+            True if the resource should be kept
+        """
+        resource_type = resource['type']
+        if resource_type in self._exclude_types or any(p(resource) for p in self._exclude):
+            return False
+        if not self.include:
+            return True
+        return resource_type in self._include_types or any(p(resource) for p in self._include)
+    
+    def apply(self, resources: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Filters a list of resources
+        
+        Args:
+            resources: Resources to filter
+            
+        Returns:
+            Resources kept by the filter
+        """
+        if not self:
+            return resources
+        return [r for r in resources if self(r)]
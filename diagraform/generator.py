@@ -1,5 +1,5 @@
 """
-Module for generating diagrams from Terraform resources
+Module for rendering diagrams from Terraform resources
 """
 from typing import Dict, List, Any, Optional
 from diagrams import Diagram, Cluster
@@ -39,8 +39,35 @@ from diagrams.aws.storage import S3
 from diagrams.aws.database import RDS, Aurora, Dynamodb
 from diagrams.aws.management import CloudwatchRule as CloudwatchEventRule
 from diagrams.aws.general import General
+from .builder import GraphBuilder
+from .model import Cluster as GraphCluster, Graph, Node
+from .providers import get_resource_map
+import hashlib
 import os
-import re
+
+# diagrams resolves the icon path of every node it creates; these subclasses
+# resolve it once per node class instead
+_icon_classes = {}
+
+
+def _with_cached_icon(node_class: Any) -> Any:
+    """
+    Gets a subclass of a diagrams node class that reuses its resolved icon path
+    
+    Args:
+        node_class: diagrams node class
+        
+    Returns:
+        Subclass with the same name (so autolabels are unchanged) and a cached icon
+    """
+    if node_class not in _icon_classes:
+        cached_class = node_class
+        if node_class._icon:
+            # _load_icon only reads class attributes
+            icon_path = node_class._load_icon(node_class)
+            cached_class = type(node_class.__name__, (node_class,), {'_load_icon': lambda self: icon_path})
+        _icon_classes[node_class] = cached_class
+    return _icon_classes[node_class]
 
 
 class DiagramGenerator:
@@ -298,421 +325,149 @@ class DiagramGenerator:
         'aws_general': General,
     }
     
-    def __init__(self, resources: List[Dict[str, Any]], dependencies: Dict[str, List[str]]):
+    def __init__(self, resources: Optional[List[Dict[str, Any]]] = None,
+                 dependencies: Optional[Dict[str, List[str]]] = None):
         """
         Initializes the generator with resources and dependencies
         
         Args:
-            resources: List of resources extracted from the state
+            resources: List of resources extracted from the state (not needed
+                to render an already built graph)
             dependencies: Dictionary of resource dependencies
         """
-        self.resources = resources
-        self.dependencies = dependencies
-        self.nodes = {}  # Stores nodes created by address
+        self.resources = resources or []
+        self.dependencies = dependencies or {}
+        self.nodes = {}  # Stores the diagrams nodes rendered by address
+        self._node_classes = {}  # Node class by (resource type, subnet type)
     
-    def _determine_subnet_type(self, resource: Dict[str, Any]) -> Any:
+    def _get_node_class(self, node: Node) -> Any:
         """
-        Determines whether a subnet is public or private based on its attributes
+        Gets the diagrams node class for a graph node, resolved once per type
         
         Args:
-            resource: Subnet-type resource
+            node: Graph node to represent
             
         Returns:
-            Appropriate node class (PublicSubnet, PrivateSubnet, or Subnet)
+            Node class for the resource type (with its icon path resolved)
         """
-        name = resource.get('name', '').lower()
-        is_public = False
-        if 'values' in resource and isinstance(resource['values'], dict):
-            if resource['values'].get('map_public_ip_on_launch'):
-                is_public = True
-            tags = resource['values'].get('tags', {})
-            if isinstance(tags, dict):
-                subnet_type = tags.get('Type', '').lower()
-                if 'public' in subnet_type:
-                    is_public = True
-                elif 'private' in subnet_type:
-                    is_public = False
-        if 'public' in name:
-            is_public = True
-        elif 'private' in name:
-            is_public = False
-        return PublicSubnet if is_public else PrivateSubnet
+        key = (node.resource_type, node.attributes.get('subnet_type'))
+        node_class = self._node_classes.get(key)
+        if node_class is None:
+            node_class = _with_cached_icon(self._resolve_node_class(node))
+            self._node_classes[key] = node_class
+        return node_class
+    
+    def _resolve_node_class(self, node: Node) -> Any:
+        """
+        Looks up the diagrams node class for a graph node, loading the provider map lazily
+        
+        Args:
+            node: Graph node to represent
+            
+        Returns:
+            Node class for the resource type, or General as a fallback
+        """
+        resource_type = node.resource_type
+        
+        # Special case for subnets
+        if resource_type == 'aws_subnet':
+            return PublicSubnet if node.attributes.get('subnet_type') == 'public' else PrivateSubnet
+        
+        if resource_type.startswith('aws_'):
+            return self.AWS_RESOURCE_MAP.get(resource_type, General)
+        
+        # Non-AWS providers are only imported when the state contains them
+        return get_resource_map(resource_type).get(resource_type, General)
     
     def generate(self, output_path: str, filename: str = "terraform_diagram", show: bool = True, 
                  filter_types: List[str] = None, group_by: str = None, exclude_types: List[str] = None,
-                 nested_clusters: bool = False):
+                 nested_clusters: bool = False, focus: Optional[str] = None, radius: int = 1,
+                 direction: str = 'both', force: bool = False, module_depth: Optional[int] = None,
+                 label_template: Optional[str] = None, max_label_length: Optional[int] = None) -> bool:
         """
-        Generates the diagram and saves it to the specified path
+        Builds the graph of the resources and renders it to the specified path
         
         Args:
             output_path: Directory where the diagram will be saved
             filename: Filename (without extension)
             show: If True, opens the diagram after generation
-            filter_types: List of resource types to include (None to include all)
-            group_by: Criterion for grouping resources ('vpc', 'type', None for no grouping)
-            exclude_types: List of resource types to exclude (e.g., permissions, secrets)
+            filter_types: Filter expressions to include, e.g. 'aws_iam_*', 'module.network.**'
+                or 'tag:Env=prod' (None to include all)
+            group_by: Criterion for grouping resources ('vpc', 'type', 'module', a key of
+                PROVIDER_GROUPINGS such as 'resource-group', or None for no grouping)
+            exclude_types: Filter expressions to exclude (e.g., permissions, secrets)
             nested_clusters: If True, creates nested clusters for related resources
+            focus: Address or glob of the resources to focus on (None to draw the whole state)
+            radius: Maximum number of hops from the focused resources
+            direction: Dependencies to follow from the focus ('up', 'down' or 'both')
+            force: If True, renders even if the output is up to date
+            module_depth: With group_by='module', modules nested deeper than this are
+                collapsed into summary nodes (None to expand every module)
+            label_template: Node label template with {name}, {type}, {friendly_type},
+                {address} and {module} fields (None for the default label of the grouping)
+            max_label_length: Maximum length of each label line, longer lines are truncated
+            
+        Returns:
+            True if the diagram was rendered, False if the existing one was up to date
+        """
+        graph = GraphBuilder(self.resources, self.dependencies).build(
+            filter_types, group_by, exclude_types, nested_clusters, focus, radius, direction, module_depth,
+            label_template, max_label_length)
+        return self.render(graph, output_path, filename, show, force)
+    
+    def render(self, graph: Graph, output_path: str, filename: str = "terraform_diagram", show: bool = True,
+               force: bool = False) -> bool:
+        """
+        Renders a graph and saves it to the specified path
+        
+        The digest of the graph is stored next to the image, and rendering is
+        skipped when it matches the stored one.
+        
+        Args:
+            graph: Graph to render
+            output_path: Directory where the diagram will be saved
+            filename: Filename (without extension)
+            show: If True, opens the diagram after generation
+            force: If True, renders even if the output is up to date
+            
+        Returns:
+            True if the diagram was rendered, False if the existing one was up to date
         """
         os.makedirs(output_path, exist_ok=True)
         
+        digest = graph.digest()
+        output_file = os.path.join(output_path, f"{filename}.png")
+        digest_file = os.path.join(output_path, f"{filename}.digest")
+        if not force and os.path.exists(output_file) and os.path.exists(digest_file):
+            with open(digest_file, 'r') as f:
+                if f.read().strip() == digest:
+                    return False
+        
+        self.nodes = {}
         with Diagram("Infraestructura Terraform", filename=os.path.join(output_path, filename), show=show):
-            # Filter resources if necessary
-            filtered_resources = self.resources
-            if filter_types:
-                filtered_resources = [r for r in self.resources if r['type'] in filter_types]
-            
-            # Apply inclusion filters
-            if filter_types:
-                filtered_resources = [r for r in filtered_resources if r['type'] in filter_types]
-            
-            # Apply exclusion filters
-            if exclude_types:
-                filtered_resources = [r for r in filtered_resources if r['type'] not in exclude_types]
-            
-            # Create nodes for each resource according to the grouping type
-            if group_by == 'vpc':
-                if nested_clusters:
-                    self._generate_nested_by_vpc(filtered_resources)
-                else:
-                    self._generate_grouped_by_vpc(filtered_resources)
-            elif group_by == 'type':
-                if nested_clusters:
-                    self._generate_nested_by_type(filtered_resources)
-                else:
-                    self._generate_grouped_by_type(filtered_resources)
-            else:
-                self._generate_flat(filtered_resources)
+            nodes_by_cluster, clusters_by_parent = graph.children_index()
+            self._render_cluster(nodes_by_cluster, clusters_by_parent, None)
             
             # Connect nodes based on dependencies
-            for resource_id, deps in self.dependencies.items():
-                if resource_id in self.nodes:
-                    for dep in deps:
-                        if dep in self.nodes:
-                            self.nodes[dep] >> self.nodes[resource_id]
-    
-    def _generate_flat(self, resources: List[Dict[str, Any]]):
-        """Generates a flat diagram without grouping"""
-        for resource in resources:
-            address = resource['address']
-            resource_type = resource['type']
-            name = resource['name']
-            
-            # Special case for subnets
-            if resource_type == 'aws_subnet':
-                node_class = self._determine_subnet_type(resource)
-            else:
-                # Get the corresponding node class or use General as a fallback
-                node_class = self.AWS_RESOURCE_MAP.get(resource_type, General)
-            
-            # Create node
-            self.nodes[address] = node_class(f"{name}\n({resource_type})")
-    
-    def _generate_grouped_by_vpc(self, resources: List[Dict[str, Any]]):
-        """Generates a diagram grouped by VPC"""
-        # First identify all VPCs
-        vpcs = [r for r in resources if r['type'] == 'aws_vpc']
-        vpc_nodes = {}
-        
-        # Create clusters for each VPC
-        for vpc in vpcs:
-            vpc_address = vpc['address']
-            vpc_name = vpc.get('name', 'Unknown VPC')
-            
-            with Cluster(f"VPC: {vpc_name}"):
-                # Create node for VPC
-                vpc_node = VPC(f"{vpc_name}\n({vpc['type']})")
-                self.nodes[vpc_address] = vpc_node
-                vpc_nodes[vpc_address] = vpc_node
-                
-                # Encontrar recursos que dependen de esta VPC
-                vpc_resources = []
-                for resource in resources:
-                    if resource['type'] != 'aws_vpc':
-                        # Verificar si el recurso tiene vpc_id en sus valores
-                        if 'values' in resource and isinstance(resource['values'], dict):
-                            vpc_id = resource['values'].get('vpc_id')
-                            # Buscar la VPC correspondiente
-                            for v in vpcs:
-                                if 'values' in v and v['values'].get('id') == vpc_id:
-                                    if v['address'] == vpc_address:
-                                        vpc_resources.append(resource)
-                                        break
-                
-                # Create nodes for the resources in this VPC
-                for resource in vpc_resources:
-                    address = resource['address']
-                    resource_type = resource['type']
-                    name = resource['name']
-                    
-                    # Special case for subnets
-                    if resource_type == 'aws_subnet':
-                        node_class = self._determine_subnet_type(resource)
-                    else:
-                        node_class = self.AWS_RESOURCE_MAP.get(resource_type, General)
-                    
-                    self.nodes[address] = node_class(f"{name}\n({resource_type})")
-        
-        # Create nodes for resources that do not belong to any VPC
-        with Cluster("Global Resources"):
-            for resource in resources:
-                if resource['address'] not in self.nodes and resource['type'] != 'aws_vpc':
-                    address = resource['address']
-                    resource_type = resource['type']
-                    name = resource['name']
-                    
-                    node_class = self.AWS_RESOURCE_MAP.get(resource_type, General)
-                    self.nodes[address] = node_class(f"{name}\n({resource_type})")
-    
-    def _generate_grouped_by_type(self, resources: List[Dict[str, Any]]):
-        """Generates a diagram grouping resources by type"""
-        # grouping resources bt type
-        resource_types = {}
-        for resource in resources:
-            resource_type = resource['type']
-            if resource_type not in resource_types:
-                resource_types[resource_type] = []
-            resource_types[resource_type].append(resource)
-        
-        # Crear clusters para cada tipo de recurso
-        for resource_type, type_resources in resource_types.items():
-            # Obtener un nombre más amigable para el tipo
-            friendly_name = resource_type.replace('aws_', '').replace('_', ' ').title()
-            
-            with Cluster(f"{friendly_name}"):
-                for resource in type_resources:
-                    address = resource['address']
-                    name = resource['name']
-                    
-                    # Caso especial para subnets
-                    if resource_type == 'aws_subnet':
-                        node_class = self._determine_subnet_type(resource)
-                    else:
-                        node_class = self.AWS_RESOURCE_MAP.get(resource_type, General)
-                    
-                    self.nodes[address] = node_class(f"{name}")
-
-    def _generate_nested_by_vpc(self, resources: List[Dict[str, Any]]):
-        """Genera un diagrama con clusters anidados agrupados por VPC"""
-        # Primero identificar todas las VPCs
-        vpcs = [r for r in resources if r['type'] == 'aws_vpc']
-        vpc_nodes = {}
-        
-        # Crear clusters para cada VPC
-        for vpc in vpcs:
-            vpc_address = vpc['address']
-            vpc_name = vpc.get('name', 'Unknown VPC')
-            
-            with Cluster(f"VPC: {vpc_name}"):
-                # Crear nodo para la VPC
-                vpc_node = VPC(f"{vpc_name}\n({vpc['type']})")
-                self.nodes[vpc_address] = vpc_node
-                vpc_nodes[vpc_address] = vpc_node
-                
-                # Encontrar recursos que dependen de esta VPC
-                vpc_resources = []
-                for resource in resources:
-                    if resource['type'] != 'aws_vpc':
-                        # Verificar si el recurso tiene vpc_id en sus valores
-                        if 'values' in resource and isinstance(resource['values'], dict):
-                            vpc_id = resource['values'].get('vpc_id')
-                            # Buscar la VPC correspondiente
-                            for v in vpcs:
-                                if 'values' in v and v['values'].get('id') == vpc_id:
-                                    if v['address'] == vpc_address:
-                                        vpc_resources.append(resource)
-                                        break
-                
-                # Agrupar recursos por tipo dentro de la VPC
-                resource_by_type = {}
-                for resource in vpc_resources:
-                    resource_type = resource['type']
-                    if resource_type not in resource_by_type:
-                        resource_by_type[resource_type] = []
-                    resource_by_type[resource_type].append(resource)
-                
-                # Crear clusters anidados para cada tipo de recurso
-                for resource_type, type_resources in resource_by_type.items():
-                    # Obtener un nombre más amigable para el tipo
-                    friendly_name = resource_type.replace('aws_', '').replace('_', ' ').title()
-                    
-                    # Crear cluster para el tipo de recurso
-                    with Cluster(f"{friendly_name}"):
-                        for resource in type_resources:
-                            address = resource['address']
-                            name = resource['name']
-                            
-                            # Caso especial para subnets
-                            if resource_type == 'aws_subnet':
-                                node_class = self._determine_subnet_type(resource)
-                            else:
-                                node_class = self.AWS_RESOURCE_MAP.get(resource_type, General)
-                            
-                            self.nodes[address] = node_class(f"{name}")
-                            
-                            # Crear clusters anidados para recursos que tienen dependencias específicas
-                            if resource_type in ['aws_ecs_cluster', 'aws_eks_cluster', 'aws_rds_cluster']:
-                                self._create_nested_dependencies(resource, resources)
-        
-        # Crear nodos para recursos que no pertenecen a ninguna VPC
-        with Cluster("Recursos Globales"):
-            global_resources = [r for r in resources if r['address'] not in self.nodes and r['type'] != 'aws_vpc']
-            
-            # Agrupar recursos globales por tipo
-            global_by_type = {}
-            for resource in global_resources:
-                resource_type = resource['type']
-                if resource_type not in global_by_type:
-                    global_by_type[resource_type] = []
-                global_by_type[resource_type].append(resource)
-            
-            # Crear clusters anidados para cada tipo de recurso global
-            for resource_type, type_resources in global_by_type.items():
-                friendly_name = resource_type.replace('aws_', '').replace('_', ' ').title()
-                
-                with Cluster(f"{friendly_name}"):
-                    for resource in type_resources:
-                        address = resource['address']
-                        name = resource['name']
-                        
-                        node_class = self.AWS_RESOURCE_MAP.get(resource_type, General)
-                        self.nodes[address] = node_class(f"{name}")
-                        
-                        # Crear clusters anidados para recursos que tienen dependencias específicas
-                        if resource_type in ['aws_ecs_cluster', 'aws_eks_cluster', 'aws_rds_cluster']:
-                            self._create_nested_dependencies(resource, resources)
-
-    def _generate_nested_by_type(self, resources: List[Dict[str, Any]]):
-        """Genera un diagrama con clusters anidados agrupados por tipo"""
-        # Agrupar recursos por tipo
-        resource_types = {}
-        for resource in resources:
-            resource_type = resource['type']
-            if resource_type not in resource_types:
-                resource_types[resource_type] = []
-            resource_types[resource_type].append(resource)
-        
-        # Crear clusters para cada tipo de recurso
-        for resource_type, type_resources in resource_types.items():
-            # Obtener un nombre más amigable para el tipo
-            friendly_name = resource_type.replace('aws_', '').replace('_', ' ').title()
-            
-            with Cluster(f"{friendly_name}"):
-                for resource in type_resources:
-                    address = resource['address']
-                    name = resource['name']
-                    
-                    # Caso especial para subnets
-                    if resource_type == 'aws_subnet':
-                        node_class = self._determine_subnet_type(resource)
-                    else:
-                        node_class = self.AWS_RESOURCE_MAP.get(resource_type, General)
-                    
-                    self.nodes[address] = node_class(f"{name}")
-                    
-                    # Crear clusters anidados para recursos que tienen dependencias específicas
-                    if resource_type in ['aws_ecs_cluster', 'aws_eks_cluster', 'aws_rds_cluster']:
-                        self._create_nested_dependencies(resource, resources)
-
-    def _create_nested_dependencies(self, parent_resource: Dict[str, Any], all_resources: List[Dict[str, Any]], depth: int = 0, max_depth: int = 3, processed_resources: set[str] = None):
-        """Crea un cluster anidado para los recursos que dependen del recurso padre de manera recursiva"""
-        # Inicializar el conjunto de recursos procesados si es None
-        if processed_resources is None:
-            processed_resources = set()
-            
-        # Evitar recursión infinita o demasiado profunda
-        if depth >= max_depth:
-            return
-            
-        parent_address = parent_resource['address']
-        parent_name = parent_resource['name']
-        parent_type = parent_resource['type']
+            for edge in graph.edges:
+                self.nodes[edge.source] >> self.nodes[edge.target]
         
-        # Evitar procesar el mismo recurso más de una vez
-        if parent_address in processed_resources:
-            return
-            
-        processed_resources.add(parent_address)
-        
-        # Encontrar recursos que dependen de este recurso padre
-        dependent_resources = []
-        
-        # Buscar por ID en los valores
-        parent_id = None
-        if 'values' in parent_resource and isinstance(parent_resource['values'], dict):
-            parent_id = parent_resource['values'].get('id')
-        
-        if parent_id:
-            for resource in all_resources:
-                if resource['address'] != parent_address and resource['address'] not in processed_resources:  # Evitar el propio recurso y recursos ya procesados
-                    if 'values' in resource and isinstance(resource['values'], dict):
-                        # Buscar referencias al ID del padre en los valores
-                        for key, value in resource['values'].items():
-                            if isinstance(value, str) and parent_id in value:
-                                dependent_resources.append(resource)
-                                break
-                            elif isinstance(value, dict):
-                                for k, v in value.items():
-                                    if isinstance(v, str) and parent_id in v:
-                                        dependent_resources.append(resource)
-                                        break
-        
-        # Si encontramos recursos dependientes, crear un cluster anidado
-        if dependent_resources:
-            # Determinar un nombre apropiado para el cluster
-            if parent_type == 'aws_ecs_cluster':
-                cluster_name = f"ECS Cluster: {parent_name}"
-            elif parent_type == 'aws_eks_cluster':
-                cluster_name = f"EKS Cluster: {parent_name}"
-            elif parent_type == 'aws_rds_cluster':
-                cluster_name = f"RDS Cluster: {parent_name}"
-            elif parent_type == 'aws_autoscaling_group':
-                cluster_name = f"ASG: {parent_name}"
-            elif parent_type == 'aws_lb' or parent_type == 'aws_alb' or parent_type == 'aws_elb':
-                cluster_name = f"Load Balancer: {parent_name}"
-            else:
-                cluster_name = f"Dependencias de {parent_name}"
-            
-            # Crear un cluster para los recursos dependientes
-            with Cluster(cluster_name):
-                # Agrupar recursos dependientes por tipo para mejor organización
-                dependent_by_type = {}
-                for resource in dependent_resources:
-                    resource_type = resource['type']
-                    if resource_type not in dependent_by_type:
-                        dependent_by_type[resource_type] = []
-                    dependent_by_type[resource_type].append(resource)
-                
-                # Si hay múltiples tipos, crear subclusters por tipo
-                if len(dependent_by_type) > 1:
-                    for resource_type, type_resources in dependent_by_type.items():
-                        friendly_name = resource_type.replace('aws_', '').replace('_', ' ').title()
-                        
-                        with Cluster(f"{friendly_name}"):
-                            for resource in type_resources:
-                                self._process_resource_node(resource)
-                                # Llamada recursiva para crear clusters anidados más profundos
-                                if resource['type'] in ['aws_ecs_cluster', 'aws_eks_cluster', 'aws_rds_cluster', 'aws_autoscaling_group', 'aws_lb', 'aws_alb', 'aws_elb']:
-                                    self._create_nested_dependencies(resource, all_resources, depth + 1, max_depth, processed_resources)
-                else:
-                    # Si solo hay un tipo, no crear subcluster adicional
-                    for resource in dependent_resources:
-                        self._process_resource_node(resource)
-                        # Llamada recursiva para crear clusters anidados más profundos
-                        if resource['type'] in ['aws_ecs_cluster', 'aws_eks_cluster', 'aws_rds_cluster', 'aws_autoscaling_group', 'aws_lb', 'aws_alb', 'aws_elb']:
-                            self._create_nested_dependencies(resource, all_resources, depth + 1, max_depth, processed_resources)
+        with open(digest_file, 'w') as f:
+            f.write(digest)
+        return True
     
-    def _process_resource_node(self, resource):
-        """Processes a resource and creates its corresponding node"""
-        address = resource['address']
-        name = resource['name']
-        resource_type = resource['type']
-        
-        # Evitar crear nodos duplicados
-        if address not in self.nodes:
-            # Caso especial para subnets
-            if resource_type == 'aws_subnet':
-                node_class = self._determine_subnet_type(resource)
-            else:
-                node_class = self.AWS_RESOURCE_MAP.get(resource_type, General)
-            
-            self.nodes[address] = node_class(f"{name}")
\ No newline at end of file
+    def _render_cluster(self, nodes_by_cluster: Dict[Optional[str], List[Node]],
+                        clusters_by_parent: Dict[Optional[str], List[GraphCluster]], cluster_id: Optional[str]):
+        """Renders the nodes of a cluster, then its nested clusters (indexes from Graph.children_index())"""
+        for node in nodes_by_cluster.get(cluster_id, ()):
+            # IDs derived from addresses keep the DOT output identical for identical inputs
+            node_class = self._get_node_class(node)
+            nodeid = hashlib.sha1(node.id.encode('utf-8')).hexdigest()
+            self.nodes[node.id] = node_class(node.label, nodeid=nodeid)
+        
+        for cluster in clusters_by_parent.get(cluster_id, ()):
+            with Cluster(cluster.label) as diagram_cluster:
+                # diagrams names subgraphs after their label, and Graphviz merges subgraphs
+                # sharing a name (e.g. two 'db' modules), so use the unique cluster id instead
+                diagram_cluster.dot.name = cluster.id
+                self._render_cluster(nodes_by_cluster, clusters_by_parent, cluster.id)
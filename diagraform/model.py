@@ -0,0 +1,256 @@
+"""
+Renderer-independent graph model of Terraform resources
+"""
+import hashlib
+import json
+from contextlib import contextmanager
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+
+
+class Node:
+    """A resource (or a summary of several resources) in the graph"""
+
+    def __init__(self, node_id: str, label: str, resource_type: str, cluster: Optional[str] = None,
+                 attributes: Optional[Dict[str, Any]] = None):
+        """
+        Initializes the node
+
+        Args:
+            node_id: Unique identifier, usually the resource address
+            label: Text shown for the node
+            resource_type: Terraform resource type, used to pick an icon
+            cluster: Identifier of the cluster containing the node (None for the top level)
+            attributes: Extra renderer hints (e.g. 'subnet_type')
+        """
+        self.id = node_id
+        self.label = label
+        self.resource_type = resource_type
+        self.cluster = cluster
+        self.attributes = attributes or {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'label': self.label,
+            'resource_type': self.resource_type,
+            'cluster': self.cluster,
+            'attributes': self.attributes,
+        }
+
+    def __repr__(self) -> str:
+        return f"Node({self.id!r})"
+
+
+class Edge:
+    """A dependency between two nodes, drawn from source to target"""
+
+    def __init__(self, source: str, target: str, attributes: Optional[Dict[str, Any]] = None):
+        """
+        Initializes the edge
+
+        Args:
+            source: Identifier of the node depended upon
+            target: Identifier of the dependent node
+            attributes: Extra renderer hints
+        """
+        self.source = source
+        self.target = target
+        self.attributes = attributes or {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'source': self.source, 'target': self.target, 'attributes': self.attributes}
+
+    def __repr__(self) -> str:
+        return f"Edge({self.source!r} -> {self.target!r})"
+
+
+class Cluster:
+    """A group of nodes and nested clusters"""
+
+    def __init__(self, cluster_id: str, label: str, parent: Optional[str] = None,
+                 attributes: Optional[Dict[str, Any]] = None):
+        """
+        Initializes the cluster
+
+        Args:
+            cluster_id: Unique identifier
+            label: Text shown for the cluster
+            parent: Identifier of the enclosing cluster (None for the top level)
+            attributes: Extra renderer hints
+        """
+        self.id = cluster_id
+        self.label = label
+        self.parent = parent
+        self.attributes = attributes or {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'id': self.id, 'label': self.label, 'parent': self.parent, 'attributes': self.attributes}
+
+    def __repr__(self) -> str:
+        return f"Cluster({self.label!r})"
+
+
+class Graph:
+    """Nodes, edges and clusters of a diagram, independent of how it is rendered"""
+
+    def __init__(self, attributes: Optional[Dict[str, Any]] = None):
+        """
+        Initializes an empty graph
+
+        Args:
+            attributes: Graph-level attributes (e.g. the view options it was built with)
+        """
+        self.attributes = attributes or {}
+        self.nodes: Dict[str, Node] = {}
+        self.edges: List[Edge] = []
+        self.clusters: Dict[str, Cluster] = {}
+        self._edge_keys = set()
+        self._upstream: Dict[str, List[str]] = {}
+        self._downstream: Dict[str, List[str]] = {}
+        self._cluster_stack: List[str] = []
+
+    def add_node(self, node_id: str, label: str, resource_type: str, cluster: Optional[str] = None,
+                 **attributes: Any) -> Node:
+        """
+        Adds a node, placing it in the current cluster unless one is given
+
+        Returns:
+            The created node
+        """
+        if cluster is None and self._cluster_stack:
+            cluster = self._cluster_stack[-1]
+        node = Node(node_id, label, resource_type, cluster, attributes)
+        self.nodes[node_id] = node
+        return node
+
+    def add_edge(self, source: str, target: str, **attributes: Any) -> Optional[Edge]:
+        """
+        Adds an edge between two existing nodes, ignoring duplicates and self-loops
+
+        Returns:
+            The created edge, or None if it was not added
+        """
+        key = (source, target)
+        if source == target or key in self._edge_keys or source not in self.nodes or target not in self.nodes:
+            return None
+        self._edge_keys.add(key)
+        self._upstream.setdefault(target, []).append(source)
+        self._downstream.setdefault(source, []).append(target)
+        edge = Edge(source, target, attributes)
+        self.edges.append(edge)
+        return edge
+
+    def add_cluster(self, label: str, parent: Optional[str] = None, **attributes: Any) -> Cluster:
+        """
+        Adds a cluster, nested in the current cluster unless a parent is given
+
+        Returns:
+            The created cluster
+        """
+        if parent is None and self._cluster_stack:
+            parent = self._cluster_stack[-1]
+        cluster = Cluster(f"cluster_{len(self.clusters)}", label, parent, attributes)
+        self.clusters[cluster.id] = cluster
+        return cluster
+
+    @contextmanager
+    def cluster(self, label: str, **attributes: Any) -> Iterator[Cluster]:
+        """
+        Context manager that adds a cluster and makes it the current one,
+        mirroring diagrams' `with Cluster(...)` blocks
+        """
+        cluster = self.add_cluster(label, **attributes)
+        self._cluster_stack.append(cluster.id)
+        try:
+            yield cluster
+        finally:
+            self._cluster_stack.pop()
+
+    def children(self, cluster_id: Optional[str] = None) -> Tuple[List[Node], List[Cluster]]:
+        """
+        Gets the direct contents of a cluster
+
+        Args:
+            cluster_id: Cluster identifier (None for the top level)
+
+        Returns:
+            Tuple with the nodes and clusters directly inside the cluster
+        """
+        nodes = [n for n in self.nodes.values() if n.cluster == cluster_id]
+        clusters = [c for c in self.clusters.values() if c.parent == cluster_id]
+        return nodes, clusters
+
+    def children_index(self) -> Tuple[Dict[Optional[str], List[Node]], Dict[Optional[str], List[Cluster]]]:
+        """
+        Groups the nodes and clusters by the cluster containing them, in one pass
+
+        Use it instead of calling children() for every cluster when walking the whole tree.
+
+        Returns:
+            Tuple with the nodes and the clusters by parent cluster identifier (None for the top level)
+        """
+        nodes = {}
+        for node in self.nodes.values():
+            nodes.setdefault(node.cluster, []).append(node)
+        clusters = {}
+        for cluster in self.clusters.values():
+            clusters.setdefault(cluster.parent, []).append(cluster)
+        return nodes, clusters
+
+    def predecessors(self, node_id: str) -> List[str]:
+        """Gets the identifiers of the nodes a node depends on"""
+        return list(self._upstream.get(node_id, ()))
+
+    def successors(self, node_id: str) -> List[str]:
+        """Gets the identifiers of the nodes depending on a node"""
+        return list(self._downstream.get(node_id, ()))
+
+    def cluster_depth(self) -> int:
+        """Gets the maximum nesting depth of the clusters (0 if there are none)"""
+        depths = {}
+        for cluster in self.clusters.values():
+            # Parents are always added before their children
+            depths[cluster.id] = depths.get(cluster.parent, 0) + 1
+        return max(depths.values(), default=0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializes the graph into plain dictionaries and lists"""
+        return {
+            'attributes': self.attributes,
+            'clusters': [c.to_dict() for c in self.clusters.values()],
+            'nodes': [n.to_dict() for n in self.nodes.values()],
+            'edges': [e.to_dict() for e in self.edges],
+        }
+
+    def to_json(self, **kwargs: Any) -> str:
+        """Serializes the graph to JSON"""
+        return json.dumps(self.to_dict(), **kwargs)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Graph':
+        """Rebuilds a graph serialized with to_dict()"""
+        graph = cls(data.get('attributes'))
+        for cluster in data.get('clusters', []):
+            graph.clusters[cluster['id']] = Cluster(cluster['id'], cluster['label'], cluster.get('parent'),
+                                                    cluster.get('attributes'))
+        for node in data.get('nodes', []):
+            graph.nodes[node['id']] = Node(node['id'], node['label'], node['resource_type'], node.get('cluster'),
+                                           node.get('attributes'))
+        for edge in data.get('edges', []):
+            graph.add_edge(edge['source'], edge['target'], **edge.get('attributes', {}))
+        return graph
+
+    @classmethod
+    def from_json(cls, text: str) -> 'Graph':
+        """Rebuilds a graph serialized with to_json()"""
+        return cls.from_dict(json.loads(text))
+
+    def digest(self) -> str:
+        """
+        Computes a content hash of the graph
+
+        Returns:
+            Hex SHA-256 digest of the canonical JSON serialization
+        """
+        payload = json.dumps(self.to_dict(), sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
@@ -2,7 +2,239 @@
 Module for analyzing Terraform state files
 """
 import json
-from typing import Dict, List, Any, Set, Tuple
+import mmap
+import os
+from typing import Callable, Dict, List, Any, Set, Tuple, Optional
+
+# Optional fast JSON decoders, used in this order of preference
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+if orjson is not None:
+    JSON_BACKEND = 'orjson'
+elif simdjson is not None:
+    JSON_BACKEND = 'simdjson'
+else:
+    JSON_BACKEND = 'json'
+
+# Separates the workspace from the address of resources merged from several states
+WORKSPACE_SEPARATOR = '::'
+
+# Reference attribute suffixes resolved during dependency inference
+REFERENCE_SUFFIXES = ('_id', '_ids', '_arn', '_arns')
+
+# Resource type -> resource types it may be linked to by inferred references.
+# Only these pairs produce edges, which keeps the diagram readable.
+INFERRED_DEPENDENCY_ALLOWLIST = {
+    'aws_subnet': {'aws_vpc'},
+    'aws_internet_gateway': {'aws_vpc'},
+    'aws_route_table': {'aws_vpc'},
+    'aws_route': {'aws_route_table', 'aws_internet_gateway', 'aws_nat_gateway', 'aws_transit_gateway',
+                  'aws_vpc_peering_connection'},
+    'aws_route_table_association': {'aws_route_table', 'aws_subnet'},
+    'aws_nat_gateway': {'aws_subnet', 'aws_eip'},
+    'aws_security_group': {'aws_vpc'},
+    'aws_security_group_rule': {'aws_security_group'},
+    'aws_vpc_security_group_ingress_rule': {'aws_security_group'},
+    'aws_vpc_security_group_egress_rule': {'aws_security_group'},
+    'aws_vpc_endpoint': {'aws_vpc', 'aws_subnet', 'aws_security_group', 'aws_route_table'},
+    'aws_instance': {'aws_subnet', 'aws_security_group', 'aws_iam_instance_profile', 'aws_ebs_volume'},
+    'aws_eip': {'aws_instance', 'aws_network_interface'},
+    'aws_network_interface': {'aws_subnet', 'aws_security_group'},
+    'aws_launch_template': {'aws_security_group', 'aws_iam_instance_profile'},
+    'aws_autoscaling_group': {'aws_subnet', 'aws_launch_template', 'aws_lb_target_group'},
+    'aws_lb': {'aws_subnet', 'aws_security_group'},
+    'aws_lb_listener': {'aws_lb', 'aws_lb_target_group', 'aws_acm_certificate'},
+    'aws_lb_target_group': {'aws_vpc'},
+    'aws_lb_target_group_attachment': {'aws_lb_target_group', 'aws_instance'},
+    'aws_db_subnet_group': {'aws_subnet'},
+    'aws_db_instance': {'aws_db_subnet_group', 'aws_security_group', 'aws_kms_key', 'aws_rds_cluster'},
+    'aws_rds_cluster': {'aws_db_subnet_group', 'aws_security_group', 'aws_kms_key'},
+    'aws_rds_cluster_instance': {'aws_rds_cluster'},
+    'aws_elasticache_cluster': {'aws_security_group', 'aws_elasticache_subnet_group'},
+    'aws_elasticache_subnet_group': {'aws_subnet'},
+    'aws_lambda_function': {'aws_subnet', 'aws_security_group', 'aws_iam_role', 'aws_kms_key'},
+    'aws_ecs_service': {'aws_ecs_cluster', 'aws_ecs_task_definition', 'aws_subnet', 'aws_security_group',
+                        'aws_lb_target_group', 'aws_iam_role'},
+    'aws_ecs_task_definition': {'aws_iam_role'},
+    'aws_eks_cluster': {'aws_subnet', 'aws_security_group', 'aws_iam_role'},
+    'aws_eks_node_group': {'aws_eks_cluster', 'aws_subnet', 'aws_iam_role'},
+    'aws_iam_instance_profile': {'aws_iam_role'},
+    'aws_iam_role_policy_attachment': {'aws_iam_role', 'aws_iam_policy'},
+    'aws_s3_bucket_policy': {'aws_s3_bucket'},
+    'aws_cloudfront_distribution': {'aws_acm_certificate', 'aws_waf_web_acl', 'aws_wafv2_web_acl'},
+    'aws_route53_record': {'aws_route53_zone'},
+    'aws_efs_mount_target': {'aws_efs_file_system', 'aws_subnet', 'aws_security_group'},
+    'aws_cloudwatch_log_group': {'aws_kms_key'},
+}
+
+
+def load_json_file(path: str) -> Any:
+    """
+    Loads a JSON file by memory-mapping it and decoding the bytes directly,
+    with orjson or simdjson when installed and the standard library otherwise
+    
+    Args:
+        path: Path to the JSON file
+        
+    Returns:
+        The decoded document
+    """
+    with open(path, 'rb') as f:
+        # Empty files cannot be mapped; let the decoder report them
+        if os.fstat(f.fileno()).st_size == 0:
+            return json.loads(f.read())
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if orjson is not None:
+                with memoryview(mapped) as view:
+                    return orjson.loads(view)
+            if simdjson is not None:
+                return simdjson.Parser().parse(mapped[:], recursive=True)
+            return json.loads(mapped[:])
+
+
+def build_id_index(resources: List[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Builds the index of resource identifiers (values.id and values.arn) to addresses
+    
+    Managed resources take precedence over data sources reading the same object.
+    
+    Args:
+        resources: List of resources
+        
+    Returns:
+        Dictionary of identifiers to addresses
+    """
+    address_by_id = {}
+    data_ids = set()
+    for resource in resources:
+        values = resource.get('values')
+        if not isinstance(values, dict):
+            continue
+        is_data = resource.get('mode') == 'data'
+        for key in ('id', 'arn'):
+            identifier = values.get(key)
+            if not isinstance(identifier, str) or not identifier:
+                continue
+            if identifier not in address_by_id or (identifier in data_ids and not is_data):
+                address_by_id[identifier] = resource['address']
+                if is_data:
+                    data_ids.add(identifier)
+                else:
+                    data_ids.discard(identifier)
+    return address_by_id
+
+
+def infer_dependencies(resources: List[Dict[str, Any]], dependencies: Dict[str, List[str]],
+                       allowlist: Optional[Dict[str, Set[str]]] = None) -> Dict[str, List[str]]:
+    """
+    Infers dependencies from attribute references and merges them into the given ones
+    
+    A global index of every resource's values.id and values.arn is built first,
+    then every *_id, *_ids, *_arn and *_arns attribute is resolved against it
+    in a single pass over the resources.
+    
+    Args:
+        resources: List of resources
+        dependencies: Dictionary of dependencies, updated in place
+        allowlist: Resource type -> resource types it may depend on
+            (INFERRED_DEPENDENCY_ALLOWLIST if None)
+            
+    Returns:
+        Dictionary of dependencies including the inferred ones
+    """
+    if allowlist is None:
+        allowlist = INFERRED_DEPENDENCY_ALLOWLIST
+    
+    address_by_id = build_id_index(resources)
+    type_by_address = {resource['address']: resource['type'] for resource in resources}
+    
+    for resource in resources:
+        allowed_types = allowlist.get(resource['type'])
+        values = resource.get('values')
+        if not allowed_types or not isinstance(values, dict):
+            continue
+        
+        address = resource['address']
+        deps = dependencies.setdefault(address, [])
+        known = set(deps)
+        for reference in _iter_references(values):
+            target = address_by_id.get(reference)
+            if target and target != address and target not in known and type_by_address[target] in allowed_types:
+                deps.append(target)
+                known.add(target)
+    
+    return dependencies
+
+
+def _iter_references(values: Any):
+    """Yields the string values of reference attributes, including those in nested blocks"""
+    if isinstance(values, dict):
+        for key, value in values.items():
+            if key.endswith(REFERENCE_SUFFIXES):
+                if isinstance(value, str):
+                    yield value
+                    continue
+                if isinstance(value, list) and all(isinstance(v, str) for v in value):
+                    yield from value
+                    continue
+            if isinstance(value, (dict, list)):
+                yield from _iter_references(value)
+    elif isinstance(values, list):
+        for item in values:
+            if isinstance(item, (dict, list)):
+                yield from _iter_references(item)
+
+
+def get_module_path(address: str) -> List[str]:
+    """
+    Gets the module path of a resource address
+    
+    Args:
+        address: Resource address, e.g. 'module.app.module.db["main"].aws_db_instance.this'
+        
+    Returns:
+        Module address of every level, e.g. ['module.app', 'module.app.module.db["main"]']
+        (empty for resources in the root module), keeping any workspace prefix
+    """
+    # Addresses merged from several states are prefixed with their workspace
+    prefix = ''
+    head, separator, rest = address.partition(WORKSPACE_SEPARATOR)
+    if separator and '.' not in head and '[' not in head:
+        prefix = head + separator
+        address = rest
+    
+    # Split on dots outside of index brackets, which may contain quoted dots
+    segments = []
+    start = 0
+    depth = 0
+    quoted = False
+    for i, char in enumerate(address):
+        if char == '"' and depth:
+            quoted = not quoted
+        elif char == '[' and not quoted:
+            depth += 1
+        elif char == ']' and not quoted:
+            depth -= 1
+        elif char == '.' and not depth:
+            segments.append(address[start:i])
+            start = i + 1
+    segments.append(address[start:])
+    
+    path = []
+    i = 0
+    while i + 2 < len(segments) and segments[i] == 'module':
+        path.append(prefix + '.'.join(segments[:i + 2]))
+        i += 2
+    return path
 
 
 class TerraformStateParser:
@@ -20,26 +252,28 @@ class TerraformStateParser:
         self.resources = []
         self.dependencies = {}
         
-    def parse(self) -> Tuple[List[Dict[str, Any]], Dict[str, List[str]]]:
+    def parse(self, resource_filter: Optional[Callable[[Dict[str, Any]], bool]] = None
+              ) -> Tuple[List[Dict[str, Any]], Dict[str, List[str]]]:
         """
         Analyzes the state file and extracts resources and dependencies
         
+        Args:
+            resource_filter: Predicate applied while extracting resources (e.g. a
+                ResourceFilter); resources it rejects are never kept
+        
         Returns:
             Tuple with the list of resources and dictionary of dependencies
         """
-        with open(self.state_file_path, 'r') as f:
-            self.state_data = json.load(f)
+        self.state_data = load_json_file(self.state_file_path)
             
         # Extract resources from the root module
         if 'values' in self.state_data and 'root_module' in self.state_data['values']:
             root_resources = self.state_data['values']['root_module'].get('resources', [])
-            self.resources.extend(root_resources)
+            self._add_resources(root_resources, resource_filter)
             
-            # Extract resources from nested modules if they exist
-            if 'child_modules' in self.state_data['values']['root_module']:
-                for module in self.state_data['values']['root_module']['child_modules']:
-                    if 'resources' in module:
-                        self.resources.extend(module['resources'])
+            # Extract resources from nested modules at every depth
+            for module in self.state_data['values']['root_module'].get('child_modules', []):
+                self._add_module(module, resource_filter)
         
         # Extract dependencies
         for resource in self.resources:
@@ -48,10 +282,41 @@ class TerraformStateParser:
             
             # Check if there are explicit dependencies
             if 'depends_on' in resource:
-                self.dependencies[resource_id] = resource['depends_on']
+                self.dependencies[resource_id] = list(resource['depends_on'])
                 
         return self.resources, self.dependencies
     
+    def _add_module(self, module: Dict[str, Any], resource_filter: Optional[Callable[[Dict[str, Any]], bool]] = None):
+        """Adds the resources of a child module and, recursively, of its own child modules"""
+        self._add_resources(module.get('resources', []), resource_filter)
+        for child in module.get('child_modules', []):
+            self._add_module(child, resource_filter)
+    
+    def _add_resources(self, resources: List[Dict[str, Any]],
+                       resource_filter: Optional[Callable[[Dict[str, Any]], bool]] = None):
+        """Adds the resources of a module, skipping those rejected by the filter"""
+        if resource_filter:
+            self.resources.extend(r for r in resources if resource_filter(r))
+        else:
+            self.resources.extend(resources)
+    
+    def infer_dependencies(self, allowlist: Optional[Dict[str, Set[str]]] = None) -> Dict[str, List[str]]:
+        """
+        Infers dependencies from attribute references (e.g. an instance's subnet_id)
+        and merges them into the explicit ones
+        
+        Args:
+            allowlist: Resource type -> resource types it may depend on
+                (INFERRED_DEPENDENCY_ALLOWLIST if None)
+                
+        Returns:
+            Dictionary of dependencies including the inferred ones
+        """
+        if not self.resources:
+            self.parse()
+        
+        return infer_dependencies(self.resources, self.dependencies, allowlist)
+    
     def get_resource_types(self) -> Set[str]:
         """
         Gets the unique resource types in the state
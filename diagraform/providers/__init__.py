@@ -0,0 +1,120 @@
+"""
+Provider-specific resource maps for non-AWS Terraform providers
+
+The node class maps live in one module per provider and are imported lazily,
+the first time a resource with that provider's prefix is seen, so AWS-only
+states never pay the cost of importing the Azure, GCP or Kubernetes icons.
+"""
+import importlib
+from functools import lru_cache
+from typing import Dict, Any, Optional
+
+# Resource type prefix -> module holding the RESOURCE_MAP for that provider
+PROVIDER_MODULES = {
+    'azurerm_': 'diagraform.providers.azure',
+    'google_': 'diagraform.providers.gcp',
+    'kubernetes_': 'diagraform.providers.kubernetes',
+}
+
+# Provider-specific container groupings, resolved the same way as the VPC
+# grouping: members point at their container through one of 'member_keys'
+# and containers are identified by any of their 'container_keys'.
+# Nested keys are written as dotted paths (list indexes included).
+PROVIDER_GROUPINGS = {
+    'resource-group': {
+        'label': 'Resource Group',
+        'container_types': ['azurerm_resource_group'],
+        'member_keys': ['resource_group_name'],
+        'container_keys': ['name'],
+    },
+    'network': {
+        'label': 'Network',
+        'container_types': ['google_compute_network'],
+        'member_keys': ['network'],
+        'container_keys': ['self_link', 'id', 'name'],
+    },
+    'namespace': {
+        'label': 'Namespace',
+        'container_types': ['kubernetes_namespace', 'kubernetes_namespace_v1'],
+        'member_keys': ['metadata.0.namespace'],
+        'container_keys': ['metadata.0.name'],
+    },
+}
+
+_loaded_maps: Dict[str, Dict[str, Any]] = {}
+
+
+def get_provider_prefix(resource_type: str) -> Optional[str]:
+    """
+    Gets the known provider prefix of a resource type
+    
+    Args:
+        resource_type: Terraform resource type
+        
+    Returns:
+        The matching prefix, or None if the provider is not supported
+    """
+    for prefix in PROVIDER_MODULES:
+        if resource_type.startswith(prefix):
+            return prefix
+    return None
+
+
+def get_resource_map(resource_type: str) -> Dict[str, Any]:
+    """
+    Gets the resource map of the provider a resource type belongs to,
+    importing the provider module on first use
+    
+    Args:
+        resource_type: Terraform resource type
+        
+    Returns:
+        Mapping of resource types to diagrams node classes (empty if the
+        provider is not supported)
+    """
+    prefix = get_provider_prefix(resource_type)
+    if prefix is None:
+        return {}
+    if prefix not in _loaded_maps:
+        module = importlib.import_module(PROVIDER_MODULES[prefix])
+        _loaded_maps[prefix] = module.RESOURCE_MAP
+    return _loaded_maps[prefix]
+
+
+@lru_cache(maxsize=None)
+def friendly_type_name(resource_type: str) -> str:
+    """
+    Builds a human readable name for a resource type (e.g. 'Security Group')
+    
+    Args:
+        resource_type: Terraform resource type
+        
+    Returns:
+        Resource type without its provider prefix, in title case
+    """
+    prefix = get_provider_prefix(resource_type) or 'aws_'
+    if resource_type.startswith(prefix):
+        resource_type = resource_type[len(prefix):]
+    return resource_type.replace('_', ' ').title()
+
+
+def get_value(values: Dict[str, Any], path: str) -> Any:
+    """
+    Reads a (possibly nested) attribute from a resource's values
+    
+    Args:
+        values: The 'values' dictionary of a resource
+        path: Dotted attribute path, e.g. 'metadata.0.namespace'
+        
+    Returns:
+        The attribute value, or None if any segment is missing
+    """
+    current = values
+    for key in path.split('.'):
+        if isinstance(current, dict):
+            current = current.get(key)
+        elif isinstance(current, list) and key.isdigit() and int(key) < len(current):
+            current = current[int(key)]
+        else:
+            return None
+    return current
@@ -0,0 +1,117 @@
+"""
+Mapping of Azure (azurerm) resource types to diagrams node classes
+"""
+import diagrams.azure.compute
+import diagrams.azure.network
+import diagrams.azure.storage
+import diagrams.azure.database
+import diagrams.azure.security
+import diagrams.azure.identity
+import diagrams.azure.integration
+import diagrams.azure.analytics
+import diagrams.azure.devops
+import diagrams.azure.general
+
+RESOURCE_MAP = {
+    # General
+    'azurerm_resource_group': diagrams.azure.general.Resourcegroups,
+    'azurerm_subscription': diagrams.azure.general.Subscriptions,
+
+    # Compute
+    'azurerm_virtual_machine': diagrams.azure.compute.VM,
+    'azurerm_linux_virtual_machine': diagrams.azure.compute.VMLinux,
+    'azurerm_windows_virtual_machine': diagrams.azure.compute.VMWindows,
+    'azurerm_virtual_machine_scale_set': diagrams.azure.compute.VMScaleSet,
+    'azurerm_linux_virtual_machine_scale_set': diagrams.azure.compute.VMScaleSet,
+    'azurerm_windows_virtual_machine_scale_set': diagrams.azure.compute.VMScaleSet,
+    'azurerm_availability_set': diagrams.azure.compute.AvailabilitySets,
+    'azurerm_managed_disk': diagrams.azure.compute.Disks,
+    'azurerm_kubernetes_cluster': diagrams.azure.compute.AKS,
+    'azurerm_container_registry': diagrams.azure.compute.ACR,
+    'azurerm_container_group': diagrams.azure.compute.ContainerInstances,
+    'azurerm_function_app': diagrams.azure.compute.FunctionApps,
+    'azurerm_linux_function_app': diagrams.azure.compute.FunctionApps,
+    'azurerm_windows_function_app': diagrams.azure.compute.FunctionApps,
+    'azurerm_app_service': diagrams.azure.compute.AppServices,
+    'azurerm_linux_web_app': diagrams.azure.compute.AppServices,
+    'azurerm_windows_web_app': diagrams.azure.compute.AppServices,
+    'azurerm_batch_account': diagrams.azure.compute.BatchAccounts,
+
+    # Network
+    'azurerm_virtual_network': diagrams.azure.network.VirtualNetworks,
+    'azurerm_subnet': diagrams.azure.network.Subnets,
+    'azurerm_network_interface': diagrams.azure.network.NetworkInterfaces,
+    'azurerm_network_security_group': diagrams.azure.network.NetworkSecurityGroupsClassic,
+    'azurerm_application_security_group': diagrams.azure.network.ApplicationSecurityGroups,
+    'azurerm_public_ip': diagrams.azure.network.PublicIpAddresses,
+    'azurerm_lb': diagrams.azure.network.LoadBalancers,
+    'azurerm_application_gateway': diagrams.azure.network.ApplicationGateway,
+    'azurerm_firewall': diagrams.azure.network.Firewall,
+    'azurerm_route_table': diagrams.azure.network.RouteTables,
+    'azurerm_virtual_network_gateway': diagrams.azure.network.VirtualNetworkGateways,
+    'azurerm_local_network_gateway': diagrams.azure.network.LocalNetworkGateways,
+    'azurerm_express_route_circuit': diagrams.azure.network.ExpressrouteCircuits,
+    'azurerm_private_endpoint': diagrams.azure.network.PrivateEndpoint,
+    'azurerm_dns_zone': diagrams.azure.network.DNSZones,
+    'azurerm_private_dns_zone': diagrams.azure.network.DNSPrivateZones,
+    'azurerm_frontdoor': diagrams.azure.network.FrontDoors,
+    'azurerm_cdn_profile': diagrams.azure.network.CDNProfiles,
+    'azurerm_traffic_manager_profile': diagrams.azure.network.TrafficManagerProfiles,
+    'azurerm_virtual_wan': diagrams.azure.network.VirtualWans,
+    'azurerm_network_watcher': diagrams.azure.network.NetworkWatcher,
+
+    # Storage
+    'azurerm_storage_account': diagrams.azure.storage.StorageAccounts,
+    'azurerm_storage_container': diagrams.azure.storage.BlobStorage,
+    'azurerm_storage_blob': diagrams.azure.storage.BlobStorage,
+    'azurerm_storage_queue': diagrams.azure.storage.QueuesStorage,
+    'azurerm_storage_table': diagrams.azure.storage.TableStorage,
+    'azurerm_storage_share': diagrams.azure.storage.AzureFileshares,
+    'azurerm_data_lake_store': diagrams.azure.storage.DataLakeStorage,
+    'azurerm_recovery_services_vault': diagrams.azure.storage.RecoveryServicesVaults,
+
+    # Database
+    'azurerm_mssql_server': diagrams.azure.database.SQLServers,
+    'azurerm_sql_server': diagrams.azure.database.SQLServers,
+    'azurerm_mssql_database': diagrams.azure.database.SQLDatabases,
+    'azurerm_sql_database': diagrams.azure.database.SQLDatabases,
+    'azurerm_mssql_elasticpool': diagrams.azure.database.ElasticDatabasePools,
+    'azurerm_mssql_managed_instance': diagrams.azure.database.SQLManagedInstances,
+    'azurerm_cosmosdb_account': diagrams.azure.database.CosmosDb,
+    'azurerm_postgresql_server': diagrams.azure.database.DatabaseForPostgresqlServers,
+    'azurerm_postgresql_flexible_server': diagrams.azure.database.DatabaseForPostgresqlServers,
+    'azurerm_mysql_server': diagrams.azure.database.DatabaseForMysqlServers,
+    'azurerm_mysql_flexible_server': diagrams.azure.database.DatabaseForMysqlServers,
+    'azurerm_mariadb_server': diagrams.azure.database.DatabaseForMariadbServers,
+    'azurerm_redis_cache': diagrams.azure.database.CacheForRedis,
+    'azurerm_data_factory': diagrams.azure.database.DataFactory,
+
+    # Security & Identity
+    'azurerm_key_vault': diagrams.azure.security.KeyVaults,
+    'azurerm_security_center_subscription_pricing': diagrams.azure.security.SecurityCenter,
+    'azurerm_sentinel_alert_rule_scheduled': diagrams.azure.security.Sentinel,
+    'azurerm_user_assigned_identity': diagrams.azure.identity.ManagedIdentities,
+    'azurerm_role_assignment': diagrams.azure.identity.ActiveDirectory,
+
+    # Integration
+    'azurerm_servicebus_namespace': diagrams.azure.integration.ServiceBus,
+    'azurerm_servicebus_queue': diagrams.azure.integration.ServiceBus,
+    'azurerm_servicebus_topic': diagrams.azure.integration.ServiceBus,
+    'azurerm_eventgrid_topic': diagrams.azure.integration.EventGridTopics,
+    'azurerm_eventgrid_domain': diagrams.azure.integration.EventGridDomains,
+    'azurerm_logic_app_workflow': diagrams.azure.integration.LogicApps,
+    'azurerm_api_management': diagrams.azure.integration.APIManagement,
+    'azurerm_app_configuration': diagrams.azure.integration.AppConfiguration,
+
+    # Analytics
+    'azurerm_eventhub_namespace': diagrams.azure.analytics.EventHubs,
+    'azurerm_eventhub': diagrams.azure.analytics.EventHubs,
+    'azurerm_databricks_workspace': diagrams.azure.analytics.Databricks,
+    'azurerm_log_analytics_workspace': diagrams.azure.analytics.LogAnalyticsWorkspaces,
+    'azurerm_stream_analytics_job': diagrams.azure.analytics.StreamAnalyticsJobs,
+    'azurerm_hdinsight_hadoop_cluster': diagrams.azure.analytics.HDInsightClusters,
+    'azurerm_synapse_workspace': diagrams.azure.analytics.SynapseAnalytics,
+
+    # DevOps
+    'azurerm_application_insights': diagrams.azure.devops.ApplicationInsights,
+}
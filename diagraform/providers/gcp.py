@@ -0,0 +1,95 @@
+"""
+Mapping of Google Cloud (google) resource types to diagrams node classes
+"""
+import diagrams.gcp.compute
+import diagrams.gcp.network
+import diagrams.gcp.storage
+import diagrams.gcp.database
+import diagrams.gcp.analytics
+import diagrams.gcp.security
+import diagrams.gcp.devtools
+import diagrams.gcp.operations
+import diagrams.gcp.api
+
+RESOURCE_MAP = {
+    # Compute
+    'google_compute_instance': diagrams.gcp.compute.ComputeEngine,
+    'google_compute_instance_template': diagrams.gcp.compute.ComputeEngine,
+    'google_compute_instance_group_manager': diagrams.gcp.compute.ComputeEngine,
+    'google_compute_region_instance_group_manager': diagrams.gcp.compute.ComputeEngine,
+    'google_container_cluster': diagrams.gcp.compute.GKE,
+    'google_container_node_pool': diagrams.gcp.compute.GKE,
+    'google_cloudfunctions_function': diagrams.gcp.compute.Functions,
+    'google_cloudfunctions2_function': diagrams.gcp.compute.Functions,
+    'google_app_engine_application': diagrams.gcp.compute.AppEngine,
+    'google_cloud_run_service': diagrams.gcp.compute.Run,
+    'google_cloud_run_v2_service': diagrams.gcp.compute.Run,
+
+    # Network
+    'google_compute_network': diagrams.gcp.network.VPC,
+    'google_compute_subnetwork': diagrams.gcp.network.VPC,
+    'google_compute_firewall': diagrams.gcp.network.FirewallRules,
+    'google_compute_route': diagrams.gcp.network.Routes,
+    'google_compute_router': diagrams.gcp.network.Router,
+    'google_compute_router_nat': diagrams.gcp.network.NAT,
+    'google_compute_address': diagrams.gcp.network.ExternalIpAddresses,
+    'google_compute_global_address': diagrams.gcp.network.ExternalIpAddresses,
+    'google_compute_vpn_gateway': diagrams.gcp.network.VPN,
+    'google_compute_ha_vpn_gateway': diagrams.gcp.network.VPN,
+    'google_compute_vpn_tunnel': diagrams.gcp.network.VPN,
+    'google_compute_backend_service': diagrams.gcp.network.LoadBalancing,
+    'google_compute_forwarding_rule': diagrams.gcp.network.LoadBalancing,
+    'google_compute_global_forwarding_rule': diagrams.gcp.network.LoadBalancing,
+    'google_compute_url_map': diagrams.gcp.network.LoadBalancing,
+    'google_compute_target_http_proxy': diagrams.gcp.network.LoadBalancing,
+    'google_compute_target_https_proxy': diagrams.gcp.network.LoadBalancing,
+    'google_compute_security_policy': diagrams.gcp.network.Armor,
+    'google_compute_backend_bucket': diagrams.gcp.network.CDN,
+    'google_dns_managed_zone': diagrams.gcp.network.DNS,
+    'google_dns_record_set': diagrams.gcp.network.DNS,
+
+    # Storage
+    'google_storage_bucket': diagrams.gcp.storage.GCS,
+    'google_compute_disk': diagrams.gcp.storage.PersistentDisk,
+    'google_filestore_instance': diagrams.gcp.storage.Filestore,
+
+    # Database
+    'google_sql_database_instance': diagrams.gcp.database.SQL,
+    'google_sql_database': diagrams.gcp.database.SQL,
+    'google_spanner_instance': diagrams.gcp.database.Spanner,
+    'google_spanner_database': diagrams.gcp.database.Spanner,
+    'google_bigtable_instance': diagrams.gcp.database.Bigtable,
+    'google_firestore_database': diagrams.gcp.database.Firestore,
+    'google_redis_instance': diagrams.gcp.database.Memorystore,
+
+    # Analytics
+    'google_bigquery_dataset': diagrams.gcp.analytics.BigQuery,
+    'google_bigquery_table': diagrams.gcp.analytics.BigQuery,
+    'google_pubsub_topic': diagrams.gcp.analytics.PubSub,
+    'google_pubsub_subscription': diagrams.gcp.analytics.PubSub,
+    'google_dataflow_job': diagrams.gcp.analytics.Dataflow,
+    'google_dataproc_cluster': diagrams.gcp.analytics.Dataproc,
+    'google_composer_environment': diagrams.gcp.analytics.Composer,
+
+    # Security
+    'google_kms_key_ring': diagrams.gcp.security.KMS,
+    'google_kms_crypto_key': diagrams.gcp.security.KMS,
+    'google_service_account': diagrams.gcp.security.Iam,
+    'google_project_iam_member': diagrams.gcp.security.Iam,
+    'google_project_iam_binding': diagrams.gcp.security.Iam,
+    'google_secret_manager_secret': diagrams.gcp.security.SecretManager,
+
+    # Developer tools
+    'google_artifact_registry_repository': diagrams.gcp.devtools.GCR,
+    'google_cloudbuild_trigger': diagrams.gcp.devtools.Build,
+    'google_cloud_tasks_queue': diagrams.gcp.devtools.Tasks,
+    'google_cloud_scheduler_job': diagrams.gcp.devtools.Scheduler,
+
+    # Operations
+    'google_logging_project_sink': diagrams.gcp.operations.Logging,
+    'google_monitoring_alert_policy': diagrams.gcp.operations.Monitoring,
+
+    # API
+    'google_api_gateway_gateway': diagrams.gcp.api.APIGateway,
+    'google_endpoints_service': diagrams.gcp.api.Endpoints,
+}
@@ -0,0 +1,77 @@
+"""
+Mapping of Kubernetes resource types to diagrams node classes
+"""
+import diagrams.k8s.compute
+import diagrams.k8s.network
+import diagrams.k8s.storage
+import diagrams.k8s.podconfig
+import diagrams.k8s.rbac
+import diagrams.k8s.group
+import diagrams.k8s.clusterconfig
+import diagrams.k8s.others
+
+RESOURCE_MAP = {
+    # Namespaces
+    'kubernetes_namespace': diagrams.k8s.group.Namespace,
+    'kubernetes_namespace_v1': diagrams.k8s.group.Namespace,
+
+    # Workloads
+    'kubernetes_pod': diagrams.k8s.compute.Pod,
+    'kubernetes_pod_v1': diagrams.k8s.compute.Pod,
+    'kubernetes_deployment': diagrams.k8s.compute.Deployment,
+    'kubernetes_deployment_v1': diagrams.k8s.compute.Deployment,
+    'kubernetes_replication_controller': diagrams.k8s.compute.ReplicaSet,
+    'kubernetes_stateful_set': diagrams.k8s.compute.StatefulSet,
+    'kubernetes_stateful_set_v1': diagrams.k8s.compute.StatefulSet,
+    'kubernetes_daemonset': diagrams.k8s.compute.DaemonSet,
+    'kubernetes_daemon_set_v1': diagrams.k8s.compute.DaemonSet,
+    'kubernetes_job': diagrams.k8s.compute.Job,
+    'kubernetes_job_v1': diagrams.k8s.compute.Job,
+    'kubernetes_cron_job': diagrams.k8s.compute.Cronjob,
+    'kubernetes_cron_job_v1': diagrams.k8s.compute.Cronjob,
+
+    # Network
+    'kubernetes_service': diagrams.k8s.network.Service,
+    'kubernetes_service_v1': diagrams.k8s.network.Service,
+    'kubernetes_ingress': diagrams.k8s.network.Ingress,
+    'kubernetes_ingress_v1': diagrams.k8s.network.Ingress,
+    'kubernetes_endpoints': diagrams.k8s.network.Endpoint,
+    'kubernetes_endpoints_v1': diagrams.k8s.network.Endpoint,
+    'kubernetes_network_policy': diagrams.k8s.network.NetworkPolicy,
+    'kubernetes_network_policy_v1': diagrams.k8s.network.NetworkPolicy,
+
+    # Storage
+    'kubernetes_persistent_volume': diagrams.k8s.storage.PersistentVolume,
+    'kubernetes_persistent_volume_v1': diagrams.k8s.storage.PersistentVolume,
+    'kubernetes_persistent_volume_claim': diagrams.k8s.storage.PersistentVolumeClaim,
+    'kubernetes_persistent_volume_claim_v1': diagrams.k8s.storage.PersistentVolumeClaim,
+    'kubernetes_storage_class': diagrams.k8s.storage.StorageClass,
+    'kubernetes_storage_class_v1': diagrams.k8s.storage.StorageClass,
+
+    # Configuration
+    'kubernetes_config_map': diagrams.k8s.podconfig.ConfigMap,
+    'kubernetes_config_map_v1': diagrams.k8s.podconfig.ConfigMap,
+    'kubernetes_secret': diagrams.k8s.podconfig.Secret,
+    'kubernetes_secret_v1': diagrams.k8s.podconfig.Secret,
+
+    # RBAC
+    'kubernetes_service_account': diagrams.k8s.rbac.ServiceAccount,
+    'kubernetes_service_account_v1': diagrams.k8s.rbac.ServiceAccount,
+    'kubernetes_role': diagrams.k8s.rbac.Role,
+    'kubernetes_role_v1': diagrams.k8s.rbac.Role,
+    'kubernetes_role_binding': diagrams.k8s.rbac.RoleBinding,
+    'kubernetes_role_binding_v1': diagrams.k8s.rbac.RoleBinding,
+    'kubernetes_cluster_role': diagrams.k8s.rbac.ClusterRole,
+    'kubernetes_cluster_role_v1': diagrams.k8s.rbac.ClusterRole,
+    'kubernetes_cluster_role_binding': diagrams.k8s.rbac.ClusterRoleBinding,
+    'kubernetes_cluster_role_binding_v1': diagrams.k8s.rbac.ClusterRoleBinding,
+
+    # Cluster configuration
+    'kubernetes_horizontal_pod_autoscaler': diagrams.k8s.clusterconfig.HPA,
+    'kubernetes_horizontal_pod_autoscaler_v2': diagrams.k8s.clusterconfig.HPA,
+    'kubernetes_limit_range': diagrams.k8s.clusterconfig.LimitRange,
+    'kubernetes_limit_range_v1': diagrams.k8s.clusterconfig.LimitRange,
+    'kubernetes_resource_quota': diagrams.k8s.clusterconfig.Quota,
+    'kubernetes_resource_quota_v1': diagrams.k8s.clusterconfig.Quota,
+    'kubernetes_manifest': diagrams.k8s.others.CRD,
+}
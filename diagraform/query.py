@@ -0,0 +1,93 @@
+"""
+Module for querying subgraphs of Terraform resources
+"""
+from collections import deque
+from typing import Dict, List, Any, Set, Tuple
+from .filters import compile_address_pattern
+
+
+def build_adjacency(dependencies: Dict[str, List[str]]) -> Tuple[Dict[str, Set[str]], Dict[str, Set[str]]]:
+    """
+    Builds the adjacency index of a dependency dictionary in both directions
+    
+    Args:
+        dependencies: Dictionary of resource dependencies (address -> addresses it depends on)
+        
+    Returns:
+        Tuple with the upstream index (address -> its dependencies) and the
+        downstream index (address -> its dependents)
+    """
+    upstream = {}
+    downstream = {}
+    for address, deps in dependencies.items():
+        upstream.setdefault(address, set()).update(deps)
+        for dep in deps:
+            downstream.setdefault(dep, set()).add(address)
+    return upstream, downstream
+
+
+def match_addresses(resources: List[Dict[str, Any]], pattern: str) -> Set[str]:
+    """
+    Resolves an address or glob pattern (e.g. 'module.api.aws_lb.*') to addresses,
+    with the same glob rules as address filter expressions
+    
+    Args:
+        resources: Resources to match against
+        pattern: Exact address or address glob
+        
+    Returns:
+        Set of matching addresses
+    """
+    # An exact address selects only that resource, not its count/for_each siblings
+    addresses = {resource['address'] for resource in resources}
+    if pattern in addresses:
+        return {pattern}
+    predicate = compile_address_pattern(pattern)
+    return {resource['address'] for resource in resources if predicate(resource)}
+
+
+def select_neighbourhood(resources: List[Dict[str, Any]], dependencies: Dict[str, List[str]], focus: str,
+                         radius: int = 1, direction: str = 'both') -> Tuple[List[Dict[str, Any]], Dict[str, List[str]]]:
+    """
+    Selects the resources within a number of hops of the focused resources
+    
+    Only the given resources are walked: dependencies on addresses that are not
+    among them (e.g. filtered out while parsing) are not followed.
+    
+    Args:
+        resources: List of resources extracted from the state
+        dependencies: Dictionary of resource dependencies
+        focus: Address or glob pattern of the resources to focus on
+        radius: Maximum number of hops from the focused resources
+        direction: 'up' to follow dependencies, 'down' to follow dependents, or 'both'
+        
+    Returns:
+        Tuple with the selected resources and the dependencies between them
+    """
+    upstream, downstream = build_adjacency(dependencies)
+    indexes = []
+    if direction in ('up', 'both'):
+        indexes.append(upstream)
+    if direction in ('down', 'both'):
+        indexes.append(downstream)
+    
+    known = {r['address'] for r in resources}
+    start = match_addresses(resources, focus)
+    selected = set(start)
+    queue = deque((address, 0) for address in start)
+    while queue:
+        address, distance = queue.popleft()
+        if distance >= radius:
+            continue
+        for index in indexes:
+            for neighbour in index.get(address, ()):
+                if neighbour in known and neighbour not in selected:
+                    selected.add(neighbour)
+                    queue.append((neighbour, distance + 1))
+    
+    selected_resources = [r for r in resources if r['address'] in selected]
+    selected_dependencies = {
+        address: [dep for dep in deps if dep in selected]
+        for address, deps in dependencies.items() if address in selected
+    }
+    return selected_resources, selected_dependencies
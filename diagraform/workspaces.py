@@ -0,0 +1,125 @@
+"""
+Module for merging several Terraform state files into one estate
+"""
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
+from .filters import ResourceFilter
+from .parser import TerraformStateParser, WORKSPACE_SEPARATOR, build_id_index
+
+
+def get_workspace_names(state_files: List[str]) -> Dict[str, str]:
+    """
+    Names the workspace of each state file after the file, or its directory
+    when several files share a name (e.g. network/terraform.tfstate); dots,
+    brackets, quotes and colons are replaced with underscores
+    
+    Args:
+        state_files: Paths to the state files
+        
+    Returns:
+        Dictionary of workspace names to state file paths
+    """
+    stems = [os.path.basename(path).split('.')[0] for path in state_files]
+    workspaces = {}
+    for path, stem in zip(state_files, stems):
+        name = stem
+        if stems.count(stem) > 1:
+            name = os.path.basename(os.path.dirname(os.path.abspath(path))) or stem
+        
+        # Characters of the address syntax would break parsing prefixed addresses (e.g. 'net.v2::')
+        name = re.sub(r'[.\[\]:"]', '_', name)
+        
+        # Fall back to a numeric suffix if names still collide
+        unique_name = name
+        suffix = 2
+        while unique_name in workspaces:
+            unique_name = f"{name}_{suffix}"
+            suffix += 1
+        workspaces[unique_name] = path
+    return workspaces
+
+
+def _parse_state_file(state_file: str, workspace: str, include: Optional[List[str]],
+                      exclude: Optional[List[str]]) -> Tuple[List[Dict[str, Any]], Dict[str, List[str]]]:
+    """Parses one state file in a worker process (filters are compiled there, as they are not picklable)"""
+    resource_filter = ResourceFilter(include, exclude)
+    parser = TerraformStateParser(state_file)
+    if not resource_filter:
+        return parser.parse()
+    
+    def keep(resource: Dict[str, Any]) -> bool:
+        # Tag resources with their workspace first so 'workspace:' expressions can match them
+        resource['workspace'] = workspace
+        return resource_filter(resource)
+    return parser.parse(keep)
+
+
+def parse_state_files(state_files: List[str], include: Optional[List[str]] = None,
+                      exclude: Optional[List[str]] = None,
+                      max_workers: Optional[int] = None) -> Tuple[List[Dict[str, Any]], Dict[str, List[str]]]:
+    """
+    Parses several state files concurrently and merges them into one estate
+    
+    Args:
+        state_files: Paths to the state files
+        include: Filter expressions to include (None to include all)
+        exclude: Filter expressions to exclude (None to exclude nothing)
+        max_workers: Maximum number of worker processes (defaults to the CPU count)
+        
+    Returns:
+        Tuple with the merged list of resources and dictionary of dependencies,
+        with addresses namespaced as '<workspace>::<address>'
+    """
+    workspaces = get_workspace_names(state_files)
+    names = list(workspaces)
+    paths = [workspaces[name] for name in names]
+    count = len(paths)
+    
+    with ProcessPoolExecutor(max_workers=max_workers or min(count, os.cpu_count() or 1)) as pool:
+        results = pool.map(_parse_state_file, paths, names, [include] * count, [exclude] * count)
+        parsed = dict(zip(names, results))
+    
+    return merge_states(parsed)
+
+
+def merge_states(parsed: Dict[str, Tuple[List[Dict[str, Any]], Dict[str, List[str]]]]
+                 ) -> Tuple[List[Dict[str, Any]], Dict[str, List[str]]]:
+    """
+    Merges parsed states, namespacing addresses by workspace and linking data
+    sources to the resources they read from other states
+    
+    Args:
+        parsed: Dictionary of workspace names to (resources, dependencies) tuples
+        
+    Returns:
+        Tuple with the merged list of resources and dictionary of dependencies
+    """
+    resources = []
+    dependencies = {}
+    for workspace, (state_resources, state_dependencies) in parsed.items():
+        prefix = f"{workspace}{WORKSPACE_SEPARATOR}"
+        for resource in state_resources:
+            resources.append(dict(resource, address=prefix + resource['address'], workspace=workspace))
+        for address, deps in state_dependencies.items():
+            dependencies[prefix + address] = [prefix + dep for dep in deps]
+    
+    # Cross-state edges: a data source reading an object managed in another
+    # state depends on that resource (matched by shared id or ARN)
+    address_by_id = build_id_index(resources)
+    workspace_by_address = {resource['address']: resource['workspace'] for resource in resources}
+    for resource in resources:
+        values = resource.get('values')
+        if resource.get('mode') != 'data' or not isinstance(values, dict):
+            continue
+        for key in ('id', 'arn'):
+            identifier = values.get(key)
+            target = address_by_id.get(identifier) if isinstance(identifier, str) else None
+            if target and workspace_by_address[target] != resource['workspace']:
+                deps = dependencies.setdefault(resource['address'], [])
+                if target not in deps:
+                    deps.append(target)
+                break
+    
+    return resources, dependencies
@@ -8,6 +8,10 @@ setup(
         "diagrams>=0.23.3",
         "click>=8.1.3",
     ],
+    extras_require={
+        # Faster decoding of large state files
+        'fast': ["orjson>=3.6"],
+    },
     entry_points={
         'console_scripts': [
             'diagraform=diagraform.cli:main',